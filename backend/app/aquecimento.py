@@ -0,0 +1,68 @@
+# backend/app/aquecimento.py
+"""
+Aquecimento (warm-up) das calculadoras na inicialização do servidor.
+
+Executa cada cálculo uma vez com uma entrada pequena e válida, para que importações
+tardias, caminhos de validação do Pydantic e rotinas do NumPy já estejam carregados
+antes da primeira requisição real.
+"""
+from app.models import (
+    IndicesFisicosInput, LimitesConsistenciaInput, PontoEnsaioLL,
+    CompactacaoInput, PontoEnsaioCompactacao, TensoesGeostaticasInput, CamadaSolo,
+    AcrescimoTensoesInput, PontoInteresse, CargaPontual, CargaFaixa, CargaCircular,
+    RecalqueAdensamentoInput, TempoAdensamentoInput,
+    FluxoHidraulicoInput, CamadaFluxo, ClassificacaoUSCSInput
+)
+from app.modules.indices_fisicos import calcular_indices_fisicos
+from app.modules.limites_consistencia import calcular_limites_consistencia
+from app.modules.compactacao import calcular_compactacao
+from app.modules.tensoes_geostaticas import calcular_tensoes_geostaticas
+from app.modules.acrescimo_tensoes import calcular_acrescimo_tensoes
+from app.modules.recalque_adensamento import calcular_recalque_adensamento
+from app.modules.tempo_adensamento import calcular_tempo_adensamento
+from app.modules.classificacao_uscs import classificar_uscs
+from app.routers.fluxo import analisar_fluxo
+
+
+def aquecer_calculadoras() -> None:
+    """ Chama cada calculadora uma vez (a análise de fluxo via seu orquestrador no router). """
+    ponto = PontoInteresse(x=0.5, y=0.0, z=2.0)
+
+    calcular_indices_fisicos(IndicesFisicosInput(umidade=20.0, Gs=2.7, indice_vazios=0.8))
+    calcular_limites_consistencia(LimitesConsistenciaInput(
+        pontos_ll=[
+            PontoEnsaioLL(num_golpes=15, massa_umida_recipiente=35.0, massa_seca_recipiente=28.0, massa_recipiente=10.0),
+            PontoEnsaioLL(num_golpes=35, massa_umida_recipiente=33.0, massa_seca_recipiente=27.5, massa_recipiente=10.0),
+        ],
+        massa_umida_recipiente_lp=20.0, massa_seca_recipiente_lp=18.0, massa_recipiente_lp=10.0,
+        umidade_natural=30.0, percentual_argila=20.0
+    ))
+    calcular_compactacao(CompactacaoInput(
+        pontos_ensaio=[
+            PontoEnsaioCompactacao(massa_umida_total=massa, massa_molde=4000.0, volume_molde=1000.0,
+                                   massa_umida_recipiente_w=100.0 + w, massa_seca_recipiente_w=100.0,
+                                   massa_recipiente_w=0.0)
+            for massa, w in ((5800.0, 10.0), (5950.0, 13.0), (5900.0, 16.0))
+        ],
+        Gs=2.65
+    ))
+    calcular_tensoes_geostaticas(TensoesGeostaticasInput(
+        camadas=[CamadaSolo(espessura=2.0, gama_nat=18.0, gama_sat=20.0), CamadaSolo(espessura=3.0, gama_sat=19.0)],
+        profundidade_na=1.0, altura_capilar=0.5
+    ))
+    calcular_acrescimo_tensoes(AcrescimoTensoesInput(tipo_carga="pontual", ponto_interesse=ponto, carga=CargaPontual(P=100.0)))
+    calcular_acrescimo_tensoes(AcrescimoTensoesInput(tipo_carga="faixa", ponto_interesse=ponto, carga=CargaFaixa(largura=2.0, intensidade=100.0)))
+    calcular_acrescimo_tensoes(AcrescimoTensoesInput(tipo_carga="circular", ponto_interesse=ponto, carga=CargaCircular(raio=1.5, intensidade=100.0)))
+    calcular_recalque_adensamento(RecalqueAdensamentoInput(
+        espessura_camada=5.0, indice_vazios_inicial=1.2, Cc=0.5, Cr=0.05,
+        tensao_efetiva_inicial=100.0, tensao_pre_adensamento=150.0, acrescimo_tensao=80.0
+    ))
+    calcular_tempo_adensamento(TempoAdensamentoInput(recalque_total_primario=0.3, coeficiente_adensamento=1.0, altura_drenagem=2.0, tempo=1.0))
+    calcular_tempo_adensamento(TempoAdensamentoInput(recalque_total_primario=0.3, coeficiente_adensamento=1.0, altura_drenagem=2.0, grau_adensamento_medio=90.0))
+    classificar_uscs(ClassificacaoUSCSInput(pass_peneira_200=60.0, pass_peneira_4=95.0, ll=45.0, ip=20.0))
+    analisar_fluxo(FluxoHidraulicoInput(
+        camadas=[CamadaFluxo(espessura=2.0, k=1e-5, n=0.35, gamma_sat=18.5), CamadaFluxo(espessura=3.0, k=5e-6, n=0.38, gamma_sat=19.6)],
+        direcao_permeabilidade_equivalente="vertical", gradiente_hidraulico_aplicado=0.8,
+        profundidades_tensao=[0.0, 2.0, 5.0], profundidade_na_entrada=6.0, profundidade_na_saida=1.0,
+        direcao_fluxo_vertical="ascendente"
+    ))
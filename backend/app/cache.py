@@ -0,0 +1,77 @@
+# backend/app/cache.py
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable, Optional
+
+from pydantic import BaseModel
+
+# Número máximo de resultados mantidos em memória
+TAMANHO_MAXIMO_PADRAO = 4096
+
+
+class CacheLRU:
+    """
+    Cache LRU (menos recentemente usado) seguro para threads.
+    Os cálculos rodam no threadpool, por isso o acesso é protegido por um Lock.
+    """
+
+    def __init__(self, tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO):
+        if tamanho_maximo <= 0:
+            raise ValueError("Tamanho máximo do cache deve ser positivo.")
+        self.tamanho_maximo = tamanho_maximo
+        self._dados: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def obter(self, chave: Hashable) -> Optional[Any]:
+        """ Retorna o valor guardado (marcando-o como recente) ou None. """
+        with self._lock:
+            valor = self._dados.get(chave)
+            if valor is not None:
+                self._dados.move_to_end(chave)
+            return valor
+
+    def guardar(self, chave: Hashable, valor: Any) -> None:
+        """ Guarda o valor, descartando o item mais antigo se o limite for excedido. """
+        with self._lock:
+            self._dados[chave] = valor
+            self._dados.move_to_end(chave)
+            if len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._dados.clear()
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+
+def chave_cache(funcao: Callable, dados: BaseModel) -> Hashable:
+    """
+    Chave canónica para um cálculo: a função e a entrada.
+    As entradas são modelos imutáveis (frozen): quando todos os campos são hasheáveis, o
+    próprio modelo serve de chave (hash e igualdade pelos valores dos campos), sem serializar.
+    Com listas (pontos de ensaio, camadas), usa o JSON da entrada: entradas iguais produzem o mesmo JSON.
+    """
+    try:
+        hash(dados)
+    except TypeError:
+        return (funcao.__module__, funcao.__qualname__, dados.model_dump_json())
+    return (funcao.__module__, funcao.__qualname__, dados)
+
+
+# Cache de resultados (modelos) partilhado pelos cálculos (as funções de cálculo são puras)
+cache_calculos = CacheLRU()
+
+# Cache das respostas já serializadas dos endpoints: (erro, corpo JSON em bytes)
+cache_respostas = CacheLRU()
+
+
+def calcular_com_cache(funcao: Callable, dados: BaseModel) -> Any:
+    """ Executa `funcao(dados)`, reaproveitando o resultado se a mesma entrada já foi calculada. """
+    chave = chave_cache(funcao, dados)
+    resultado = cache_calculos.obter(chave)
+    if resultado is None:
+        resultado = funcao(dados)
+        cache_calculos.guardar(chave, resultado)
+    return resultado
@@ -0,0 +1,61 @@
+# backend/app/log.py
+"""
+Logging da API sem bloquear os handlers.
+
+Os registos são colocados numa fila (QueueHandler) e formatados/escritos por uma
+thread em segundo plano (QueueListener), iniciada e parada no ciclo de vida da app.
+Os processos do pool de cálculo escrevem direto na saída (iniciar_log_processo).
+"""
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+logger = logging.getLogger("edusolo")
+
+FORMATO_LOG = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def iniciar_log(nivel: int = logging.INFO) -> None:
+    """ Liga o logger 'edusolo' a uma fila consumida por uma thread em segundo plano. """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    fila: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    saida = logging.StreamHandler()
+    saida.setFormatter(logging.Formatter(FORMATO_LOG))
+
+    _queue_handler = QueueHandler(fila)
+    _listener = QueueListener(fila, saida, respect_handler_level=True)
+    logger.addHandler(_queue_handler)
+    logger.setLevel(nivel)
+    logger.propagate = False
+    _listener.start()
+
+
+def parar_log() -> None:
+    """ Esvazia a fila e para a thread de escrita. """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    logger.removeHandler(_queue_handler)
+    logger.propagate = True
+    _listener = None
+    _queue_handler = None
+
+
+def iniciar_log_processo(nivel: int = logging.INFO) -> None:
+    """
+    Log dos processos do pool de cálculo. A thread que consome a fila só existe no
+    processo principal; nos processos do pool os registos vão direto para a saída.
+    """
+    saida = logging.StreamHandler()
+    saida.setFormatter(logging.Formatter(FORMATO_LOG))
+    logger.addHandler(saida)
+    logger.setLevel(nivel)
+    logger.propagate = False
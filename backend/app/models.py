@@ -1,22 +1,42 @@
 # backend/app/models.py
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+import math
+from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, computed_field, field_serializer, field_validator, model_validator
+from typing import Annotated, Any, Dict, List, Literal, NamedTuple, Optional, Tuple, Union
 
 # --- Modelos Gerais ---
 
-class PontoCurva(BaseModel):
+# Registros de resultado internos (PontoCurva, PontoCurvaCompactacao, TensaoPonto,
+# TensaoPontoFluxo) só são produzidos pelos módulos de cálculo, nunca recebidos do
+# cliente: são dataclasses imutáveis com __slots__, criadas sem custo de validação.
+
+@dataclass(slots=True, frozen=True)
+class PontoCurva:
     """ Representa um ponto (x, y) genérico para gráficos """
     x: float
     y: float
 
-class PontoCurvaCompactacao(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PontoCurvaCompactacao:
     """ Representa um ponto (umidade, peso_especifico_seco) para gráficos de compactação """
     umidade: float
     peso_especifico_seco: float
 
+# Configuração das entradas de cada endpoint (e dos modelos aninhados nelas, como pontos
+# de ensaio e camadas): campos desconhecidos são rejeitados e a instância validada é
+# imutável (os módulos de cálculo apenas a leem).
+CONFIG_ENTRADA = ConfigDict(extra='forbid', frozen=True)
+
+# Campo compartilhado pelas entradas que recebem o peso específico da água
+CAMPO_GAMMA_W = Field(10.0, gt=0, description="Peso específico da água (γw) (kN/m³)")
+
 # --- Modelos Módulo 1: Índices Físicos ---
 class IndicesFisicosInput(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     peso_total: Optional[float] = Field(None, description="Peso total da amostra (ex: g)")
     volume_total: Optional[float] = Field(None, description="Volume total da amostra (ex: cm³)")
     peso_solido: Optional[float] = Field(None, description="Peso dos sólidos (seco) (ex: g)")
@@ -28,7 +48,7 @@ class IndicesFisicosInput(BaseModel):
     grau_saturacao: Optional[float] = Field(None, description="Grau de saturação (S) em porcentagem (%)")
     peso_especifico_natural: Optional[float] = Field(None, description="Peso específico natural (γnat) (ex: kN/m³)")
     peso_especifico_seco: Optional[float] = Field(None, description="Peso específico seco (γd) (ex: kN/m³)")
-    peso_especifico_agua: float = Field(10.0, description="Peso específico da água (γw) (ex: kN/m³)")
+    peso_especifico_agua: float = CAMPO_GAMMA_W
 
 class IndicesFisicosOutput(BaseModel):
     # ... (inalterado) ...
@@ -42,16 +62,70 @@ class IndicesFisicosOutput(BaseModel):
     porosidade: Optional[float] = Field(None, description="n (%)")
     grau_saturacao: Optional[float] = Field(None, description="S (%)")
     umidade: Optional[float] = Field(None, description="w (%)")
-    volume_solidos_norm: Optional[float] = Field(None, description="Vs normalizado (Vs=1)")
-    volume_agua_norm: Optional[float] = Field(None, description="Vw normalizado (para Vs=1)")
-    volume_ar_norm: Optional[float] = Field(None, description="Va normalizado (para Vs=1)")
-    peso_solidos_norm: Optional[float] = Field(None, description="Ws normalizado (para Vs=1, em g se γw_gcm3=1)")
-    peso_agua_norm: Optional[float] = Field(None, description="Ww normalizado (para Vs=1, em g se γw_gcm3=1)")
     erro: Optional[str] = None
 
+    # Valores sem arredondamento usados no diagrama de fases (definidos pelo módulo de cálculo)
+    _saturacao: Optional[float] = PrivateAttr(None) # S decimal
+    _umidade: Optional[float] = PrivateAttr(None) # w decimal
+    _gama_w: float = PrivateAttr(10.0)
+
+    # --- Diagrama de fases normalizado (Vs=1): derivado dos demais campos na serialização ---
+
+    @property
+    def _gama_w_gcm3(self) -> float:
+        # Usa γw em g/cm³ para consistência com pesos em g
+        # (mesma tolerância de np.isclose(γw, 9.81, rtol=1e-2))
+        return self._gama_w / 9.81 if abs(self._gama_w - 9.81) <= 1e-8 + 1e-2 * 9.81 else self._gama_w / 10.0 # Aproximação se γw=10
+
+    def _agua_e_ar_norm(self) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """ (Vw, Va, Ww) normalizados; None quando faltam dados. """
+        if self.indice_vazios is None:
+            return None, None, None
+        vol_v_norm = round(self.indice_vazios, 3)
+        if self._saturacao is not None:
+            vol_w_norm = round(self._saturacao * vol_v_norm, 3) # Vw = S * Vv
+            peso_w_norm = round(vol_w_norm * self._gama_w_gcm3, 2) # Peso = Vw * γw
+        elif self._umidade is not None and self.peso_solidos_norm is not None:
+            # Vw a partir de w e Ws
+            peso_w_norm = round(self._umidade * self.peso_solidos_norm, 2) # Pw = w * Ps
+            vol_w_norm = round(peso_w_norm / self._gama_w_gcm3, 3) # Vw = Pw / γw
+        else:
+            return None, None, None
+        vol_a_norm = max(round(vol_v_norm - vol_w_norm, 3), 0.0) # Va = Vv - Vw (corrige pequenas imprecisões)
+        return vol_w_norm, vol_a_norm, peso_w_norm
+
+    @computed_field(description="Vs normalizado (Vs=1)")
+    @property
+    def volume_solidos_norm(self) -> Optional[float]:
+        return None if self.erro is not None else 1.0
+
+    @computed_field(description="Vw normalizado (para Vs=1)")
+    @property
+    def volume_agua_norm(self) -> Optional[float]:
+        return self._agua_e_ar_norm()[0]
+
+    @computed_field(description="Va normalizado (para Vs=1)")
+    @property
+    def volume_ar_norm(self) -> Optional[float]:
+        return self._agua_e_ar_norm()[1]
+
+    @computed_field(description="Ws normalizado (para Vs=1, em g se γw_gcm3=1)")
+    @property
+    def peso_solidos_norm(self) -> Optional[float]:
+        if self.Gs is None:
+            return None
+        return round(self.Gs * self._gama_w_gcm3, 2) # Peso = Gs * γw * Vs
+
+    @computed_field(description="Ww normalizado (para Vs=1, em g se γw_gcm3=1)")
+    @property
+    def peso_agua_norm(self) -> Optional[float]:
+        return self._agua_e_ar_norm()[2]
+
 # --- Modelos Módulo 1: Limites de Consistência ---
 class PontoEnsaioLL(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     num_golpes: int = Field(..., gt=0)
     massa_umida_recipiente: float = Field(..., description="Massa do recipiente + solo úmido (g)")
     massa_seca_recipiente: float = Field(..., description="Massa do recipiente + solo seco (g)")
@@ -59,29 +133,54 @@ class PontoEnsaioLL(BaseModel):
 
 class LimitesConsistenciaInput(BaseModel):
     # ... (inalterado) ...
-    pontos_ll: List[PontoEnsaioLL] = Field(..., min_items=2, description="Lista de pontos do ensaio de LL (pelo menos 2)")
+    model_config = CONFIG_ENTRADA
+
+    pontos_ll: List[PontoEnsaioLL] = Field(..., min_length=2, description="Lista de pontos do ensaio de LL (pelo menos 2)")
     massa_umida_recipiente_lp: float = Field(..., description="Massa do recipiente + solo úmido (g) - Ensaio LP")
     massa_seca_recipiente_lp: float = Field(..., description="Massa do recipiente + solo seco (g) - Ensaio LP")
     massa_recipiente_lp: float = Field(..., description="Massa do recipiente (g) - Ensaio LP")
     umidade_natural: Optional[float] = Field(None, description="Teor de umidade natural atual do solo in situ (%)")
     percentual_argila: Optional[float] = Field(None, ge=0, le=100, description="Percentual de argila (< 0.002mm) na amostra (%)")
 
+# Classificações possíveis (conjuntos fixos; serializadas pelo texto do membro)
+class ClassePlasticidade(str, Enum):
+    NAO_PLASTICO = "Não Plástico (NP)"
+    FRACA = "Fracamente Plástico"
+    MEDIA = "Medianamente Plástico"
+    ALTA = "Altamente Plástico"
+
+class ClasseConsistencia(str, Enum):
+    MUITO_MOLE = "Muito Mole (líquida)"
+    MOLE = "Mole"
+    MEDIA = "Média"
+    RIJA = "Rija"
+    DURA = "Dura (semi-sólida/sólida)"
+    NAO_APLICAVEL = "Não aplicável (solo Não Plástico)"
+
+class ClasseAtividade(str, Enum):
+    INATIVA = "Inativa"
+    NORMAL = "Normal"
+    ATIVA = "Ativa"
+    NAO_APLICAVEL = "Não aplicável (solo NP ou sem argila)"
+
 class LimitesConsistenciaOutput(BaseModel):
     # ... (inalterado) ...
     ll: Optional[float] = Field(None, description="Limite de Liquidez (%)")
     lp: Optional[float] = Field(None, description="Limite de Plasticidade (%)")
     ip: Optional[float] = Field(None, description="Índice de Plasticidade (%)")
     ic: Optional[float] = Field(None, description="Índice de Consistência (adimensional)")
-    classificacao_plasticidade: Optional[str] = None
-    classificacao_consistencia: Optional[str] = None
+    classificacao_plasticidade: Optional[ClassePlasticidade] = None
+    classificacao_consistencia: Optional[ClasseConsistencia] = None
     atividade_argila: Optional[float] = Field(None, description="Índice de Atividade (Ia) (adimensional)")
-    classificacao_atividade: Optional[str] = None
+    classificacao_atividade: Optional[ClasseAtividade] = None
     pontos_grafico_ll: Optional[List[PontoCurva]] = Field(None, description="Pontos (log_golpes, umidade) calculados para gráfico LL")
     erro: Optional[str] = None
 
 # --- Modelos Módulo 2: Compactação ---
 class PontoEnsaioCompactacao(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     massa_umida_total: float = Field(..., description="Massa do solo úmido + molde (ex: g ou kg)")
     massa_molde: float = Field(..., description="Massa do molde (ex: g ou kg)")
     volume_molde: float = Field(..., gt=0, description="Volume do molde (ex: cm³ ou m³)")
@@ -91,9 +190,11 @@ class PontoEnsaioCompactacao(BaseModel):
 
 class CompactacaoInput(BaseModel):
     # ... (inalterado) ...
-    pontos_ensaio: List[PontoEnsaioCompactacao] = Field(..., min_items=3, description="Lista de pontos do ensaio (pelo menos 3)")
+    model_config = CONFIG_ENTRADA
+
+    pontos_ensaio: List[PontoEnsaioCompactacao] = Field(..., min_length=3, description="Lista de pontos do ensaio (pelo menos 3)")
     Gs: Optional[float] = Field(None, gt=0, description="Densidade relativa dos grãos (Gs > 0), necessária para curva de saturação")
-    peso_especifico_agua: float = Field(10.0, gt=0, description="Peso específico da água (γw) (ex: kN/m³)")
+    peso_especifico_agua: float = CAMPO_GAMMA_W
 
 class CompactacaoOutput(BaseModel):
     # ... (inalterado) ...
@@ -106,12 +207,15 @@ class CompactacaoOutput(BaseModel):
 # --- Modelos Módulo 3: Tensões Geostáticas ---
 class CamadaSolo(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     espessura: float = Field(..., gt=0, description="Espessura da camada (m)")
     gama_nat: Optional[float] = Field(None, description="Peso específico natural (kN/m³) - Acima do NA")
     gama_sat: Optional[float] = Field(None, description="Peso específico saturado (kN/m³) - Abaixo do NA")
     Ko: float = Field(0.5, ge=0, description="Coeficiente de empuxo em repouso (adimensional)")
 
-class TensaoPonto(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TensaoPonto:
     # ... (inalterado) ...
     profundidade: float
     tensao_total_vertical: Optional[float] = None
@@ -121,63 +225,136 @@ class TensaoPonto(BaseModel):
 
 class TensoesGeostaticasInput(BaseModel):
     # ... (inalterado) ...
-    camadas: List[CamadaSolo] = Field(..., min_items=1, description="Lista das camadas de solo, da superfície para baixo")
+    model_config = CONFIG_ENTRADA
+
+    camadas: List[CamadaSolo] = Field(..., min_length=1, description="Lista das camadas de solo, da superfície para baixo")
     profundidade_na: float = Field(..., ge=0, description="Profundidade do Nível d'Água (NA) a partir da superfície (m). Usar 0 se na superfície.")
     altura_capilar: float = Field(0.0, ge=0, description="Altura da franja capilar acima do NA (m)")
-    peso_especifico_agua: float = Field(10.0, gt=0, description="Peso específico da água (γw) (kN/m³)")
+    peso_especifico_agua: float = CAMPO_GAMMA_W
 
 class TensoesGeostaticasOutput(BaseModel):
     # ... (inalterado) ...
-    pontos_calculo: List[TensaoPonto] = Field(...)
+    pontos_calculo: List[TensaoPonto] = Field(default_factory=list) # Vazio quando há erro
     erro: Optional[str] = None
 
 # --- Modelos Módulo 4: Acréscimo de Tensões ---
 class PontoInteresse(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     x: float
     y: float
     z: float = Field(..., gt=0)
 
+# Representação interna das cargas: tuplas imutáveis com os campos na ordem do modelo,
+# desempacotadas de uma vez pelas funções de cálculo (`_, x, y, P = carga.tupla`).
+class CargaPontualTupla(NamedTuple):
+    tipo: str
+    x: float
+    y: float
+    P: float
+
+class CargaFaixaTupla(NamedTuple):
+    tipo: str
+    largura: float
+    intensidade: float
+    centro_x: float
+
+class CargaCircularTupla(NamedTuple):
+    tipo: str
+    raio: float
+    intensidade: float
+    centro_x: float
+    centro_y: float
+
 class CargaPontual(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
+    tipo: Literal['pontual'] = 'pontual'
     x: float = Field(0.0)
     y: float = Field(0.0)
     P: float = Field(..., gt=0)
 
+    @cached_property
+    def tupla(self) -> CargaPontualTupla:
+        return CargaPontualTupla(self.tipo, self.x, self.y, self.P)
+
 # NOVOS MODELOS PARA CARGAS ADICIONAIS
 class CargaFaixa(BaseModel):
     """ Define uma carga em faixa infinita """
+    model_config = CONFIG_ENTRADA
+
+    tipo: Literal['faixa'] = 'faixa'
     largura: float = Field(..., gt=0, description="Largura da faixa (b) (ex: m)")
     intensidade: float = Field(..., gt=0, description="Pressão uniforme aplicada (p) (ex: kPa)")
     centro_x: float = Field(0.0, description="Coordenada X do centro da faixa na superfície") # Opcional, assume 0
 
+    @cached_property
+    def tupla(self) -> CargaFaixaTupla:
+        return CargaFaixaTupla(self.tipo, self.largura, self.intensidade, self.centro_x)
+
 class CargaCircular(BaseModel):
     """ Define uma carga circular uniforme """
+    model_config = CONFIG_ENTRADA
+
+    tipo: Literal['circular'] = 'circular'
     raio: float = Field(..., gt=0, description="Raio da área circular (R) (ex: m)")
     intensidade: float = Field(..., gt=0, description="Pressão uniforme aplicada (p) (ex: kPa)")
     centro_x: float = Field(0.0, description="Coordenada X do centro do círculo na superfície") # Opcional
     centro_y: float = Field(0.0, description="Coordenada Y do centro do círculo na superfície") # Opcional
 
+    @cached_property
+    def tupla(self) -> CargaCircularTupla:
+        return CargaCircularTupla(self.tipo, self.raio, self.intensidade, self.centro_x, self.centro_y)
+
 # Adicionar CargaRetangular aqui quando implementar Newmark
 
+# União discriminada pelo campo `tipo`: o pydantic-core valida diretamente o modelo
+# correspondente, sem tentar cada alternativa.
+Carga = Annotated[Union[CargaPontual, CargaFaixa, CargaCircular], Field(discriminator='tipo')]
+
 class AcrescimoTensoesInput(BaseModel):
     """ Dados de entrada para cálculo de acréscimo de tensões (ATUALIZADO) """
-    tipo_carga: str = Field(..., description="Tipo de carga ('pontual', 'faixa', 'circular')") # Adicionado 'faixa', 'circular'
-    ponto_interesse: PontoInteresse = Field(...)
-    carga_pontual: Optional[CargaPontual] = None
-    carga_faixa: Optional[CargaFaixa] = None
-    carga_circular: Optional[CargaCircular] = None
-    # carga_retangular: Optional[CargaRetangular] = None
+    model_config = CONFIG_ENTRADA
+
+    tipo_carga: Literal['pontual', 'faixa', 'circular'] = Field(..., description="Tipo de carga ('pontual', 'faixa', 'circular')")
+    ponto_interesse: Optional[PontoInteresse] = Field(None, description="Ponto único de cálculo")
+    pontos_interesse: Optional[List[PontoInteresse]] = Field(None, description="Vários pontos de cálculo (ex: para traçar isóbaras)")
+    carga: Carga = Field(..., description="Dados da carga; `tipo` deve coincidir com `tipo_carga`")
+
+    @model_validator(mode='after')
+    def check_tipo_carga(self):
+        if self.carga.tipo != self.tipo_carga:
+            raise ValueError(f"Carga do tipo '{self.carga.tipo}' não corresponde a tipo_carga '{self.tipo_carga}'.")
+        return self
+
+# Casas decimais de Δσv na resposta
+PRECISAO_ACRESCIMO = 4
 
 class AcrescimoTensoesOutput(BaseModel):
     # ... (inalterado) ...
     delta_sigma_v: Optional[float] = Field(None, description="Acréscimo de tensão vertical (Δσv) no ponto (ex: kPa)")
+    delta_sigma_v_pontos: Optional[List[Optional[float]]] = Field(None, description="Δσv em cada um dos `pontos_interesse`, na mesma ordem (None se indefinido)")
     metodo: Optional[str] = None
     erro: Optional[str] = None
 
+    # Os valores ficam com precisão total em Python; o arredondamento só acontece na serialização
+    @field_serializer('delta_sigma_v')
+    def arredondar_delta_sigma_v(self, valor: Optional[float]) -> Optional[float]:
+        return None if valor is None else round(valor, PRECISAO_ACRESCIMO)
+
+    @field_serializer('delta_sigma_v_pontos')
+    def arredondar_delta_sigma_v_pontos(self, valores: Optional[List[Optional[float]]]) -> Optional[List[Optional[float]]]:
+        if valores is None:
+            return None
+        return [None if v is None else round(v, PRECISAO_ACRESCIMO) for v in valores]
+
 # --- Modelos Módulo 5: Recalque por Adensamento Primário ---
 class RecalqueAdensamentoInput(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     espessura_camada: float = Field(..., gt=0)
     indice_vazios_inicial: float = Field(..., gt=0)
     Cc: float = Field(..., gt=0)
@@ -186,18 +363,25 @@ class RecalqueAdensamentoInput(BaseModel):
     tensao_pre_adensamento: float = Field(..., gt=0)
     acrescimo_tensao: float = Field(..., ge=0)
 
+class EstadoAdensamento(str, Enum):
+    NORMALMENTE_ADENSADO = "Normalmente Adensado (RPA ≈ 1)"
+    PRE_ADENSADO = "Pré-Adensado (RPA > 1)"
+    SUB_ADENSADO = "Sub-Adensado (RPA < 1) - Cálculo como Normalmente Adensado"
+
 class RecalqueAdensamentoOutput(BaseModel):
     # ... (inalterado) ...
     recalque_total_primario: Optional[float] = None
     deformacao_volumetrica: Optional[float] = None
     tensao_efetiva_final: Optional[float] = None
-    estado_adensamento: Optional[str] = None
+    estado_adensamento: Optional[EstadoAdensamento] = None
     RPA: Optional[float] = None
     erro: Optional[str] = None
 
 # --- Modelos Módulo 6: Tempo de Adensamento ---
 class TempoAdensamentoInput(BaseModel):
     # ... (inalterado) ...
+    model_config = CONFIG_ENTRADA
+
     recalque_total_primario: float = Field(..., gt=0)
     coeficiente_adensamento: float = Field(..., gt=0)
     altura_drenagem: float = Field(..., gt=0)
@@ -216,6 +400,8 @@ class TempoAdensamentoOutput(BaseModel):
 
 class CamadaFluxo(BaseModel):
     """ Propriedades de uma camada para análise de fluxo """
+    model_config = CONFIG_ENTRADA
+
     espessura: float = Field(..., gt=0)
     k: float = Field(..., ge=0, description="Coeficiente de permeabilidade (kx ou kz, ex: m/s)")
     n: Optional[float] = Field(None, gt=0, lt=1, description="Porosidade (0 < n < 1)")
@@ -223,7 +409,9 @@ class CamadaFluxo(BaseModel):
 
 class FluxoHidraulicoInput(BaseModel):
     """ Dados de entrada para análise de fluxo hidráulico 1D """
-    camadas: List[CamadaFluxo] = Field(..., min_items=1)
+    model_config = CONFIG_ENTRADA
+
+    camadas: List[CamadaFluxo] = Field(..., min_length=1)
     # Para permeabilidade equivalente
     direcao_permeabilidade_equivalente: Optional[str] = Field(None, description="'horizontal' ou 'vertical'")
     # Para cálculo de velocidades
@@ -233,9 +421,10 @@ class FluxoHidraulicoInput(BaseModel):
     profundidade_na_entrada: Optional[float] = Field(None, ge=0, description="Profundidade do NA a montante (m)")
     profundidade_na_saida: Optional[float] = Field(None, ge=0, description="Profundidade do NA a jusante (m)")
     direcao_fluxo_vertical: Optional[str] = Field(None, description="'ascendente' ou 'descendente'")
-    peso_especifico_agua: float = Field(10.0, gt=0, description="γw (kN/m³)")
+    peso_especifico_agua: float = CAMPO_GAMMA_W
 
-class TensaoPontoFluxo(BaseModel):
+@dataclass(slots=True, frozen=True)
+class TensaoPontoFluxo:
     """ Armazena os valores de tensão e carga num ponto sob fluxo """
     profundidade: float
     tensao_total_vertical: Optional[float] = None
@@ -243,8 +432,20 @@ class TensaoPontoFluxo(BaseModel):
     tensao_efetiva_vertical: Optional[float] = None
     carga_hidraulica_total: Optional[float] = None # ht = u/gamma_w + Z_elev
 
+# Casas decimais de cada resultado escalar da análise de fluxo
+PRECISAO_FLUXO = {
+    "permeabilidade_equivalente": 6,
+    "velocidade_descarga": 6,
+    "velocidade_fluxo": 6,
+    "gradiente_critico": 3,
+    "fs_liquefacao": 2,
+}
+
 class FluxoHidraulicoOutput(BaseModel):
     """ Resultados da análise de fluxo hidráulico 1D """
+    # Valida também atribuições, para que o arredondamento se aplique a `output.campo = valor`
+    model_config = ConfigDict(validate_assignment=True)
+
     permeabilidade_equivalente: Optional[float] = Field(None, description="Coeficiente de permeabilidade equivalente (k_eq)")
     velocidade_descarga: Optional[float] = Field(None, description="Velocidade de descarga (v = ki)")
     velocidade_fluxo: Optional[float] = Field(None, description="Velocidade de fluxo/percolação (vf = v/n)")
@@ -253,10 +454,20 @@ class FluxoHidraulicoOutput(BaseModel):
     pontos_tensao_fluxo: Optional[List[TensaoPontoFluxo]] = Field(None, description="Tensões calculadas em diferentes profundidades sob fluxo")
     erro: Optional[str] = None
 
+    @field_validator(*PRECISAO_FLUXO, mode='after')
+    @classmethod
+    def arredondar_resultado(cls, valor: Optional[float], info):
+        # Valores não finitos (ex: FS infinito sem fluxo ascendente) são mantidos
+        if valor is None or not math.isfinite(valor):
+            return valor
+        return round(valor, PRECISAO_FLUXO[info.field_name])
+
 # --- Modelos Módulo 8: Classificação USCS ---
 
 class ClassificacaoUSCSInput(BaseModel):
     """ Dados de entrada para classificação USCS """
+    model_config = CONFIG_ENTRADA
+
     pass_peneira_200: float = Field(..., ge=0, le=100, description="% passando na peneira #200 (0.075mm)")
     pass_peneira_4: float = Field(..., ge=0, le=100, description="% passando na peneira #4 (4.75mm)")
     ll: Optional[float] = Field(None, ge=0, description="Limite de Liquidez (%)")
@@ -266,25 +477,104 @@ class ClassificacaoUSCSInput(BaseModel):
     is_organico_fino: bool = Field(False, description="Indica se é solo fino orgânico (OL/OH)")
     is_altamente_organico: bool = Field(False, description="Indica se é Turfa (Pt)")
 
-    @validator('ip')
-    def check_ip_ll(cls, ip, values):
-        ll = values.get('ll')
-        if ll is not None and ip is not None and ip > ll:
-            #raise ValueError("Índice de Plasticidade (IP) não pode ser maior que o Limite de Liquidez (LL).")
-             # Permitir IP > LL para capturar o erro na lógica de classificação se necessário,
-             # ou pode levantar erro aqui. O módulo de limites já deve prevenir IP<0.
-             pass
-        return ip
-
-    @validator('pass_peneira_200')
-    def check_p200_p4(cls, p200, values):
-         p4 = values.get('pass_peneira_4')
-         if p4 is not None and p200 > p4:
-              raise ValueError("Percentagem passando na #200 não pode ser maior que a #4.")
-         return p200
+    @model_validator(mode='after')
+    def check_p200_p4(self):
+        # Validação única após todos os campos (IP > LL é tratado na lógica de classificação)
+        if self.pass_peneira_200 > self.pass_peneira_4:
+            raise ValueError("Percentagem passando na #200 não pode ser maior que a #4.")
+        return self
+
+# Símbolos de grupo USCS que a classificação pode produzir (inclui as classificações duplas)
+SimboloUSCS = Literal[
+    'Pt', 'GW', 'GP', 'GM', 'GC', 'SW', 'SP', 'SM', 'SC',
+    'GW-GM', 'GW-GC', 'GP-GM', 'GP-GC', 'SW-SM', 'SW-SC', 'SP-SM', 'SP-SC',
+    'ML', 'CL', 'OL', 'MH', 'CH', 'OH',
+]
 
 class ClassificacaoUSCSOutput(BaseModel):
     """ Resultado da classificação USCS """
-    classificacao: Optional[str] = Field(None, description="Símbolo do grupo USCS (ex: SW, CL, GP-GC)")
+    # Imutável: as respostas de cada grupo são instâncias únicas compartilhadas entre chamadas
+    model_config = ConfigDict(frozen=True)
+
+    classificacao: Optional[SimboloUSCS] = Field(None, description="Símbolo do grupo USCS (ex: SW, CL, GP-GC)")
     descricao: Optional[str] = Field(None, description="Descrição do grupo (ex: Areia bem graduada, Argila de baixa plasticidade)")
-    erro: Optional[str] = None
\ No newline at end of file
+    erro: Optional[str] = None
+
+# --- Modelos de Lote (Batch) ---
+# Cada endpoint de lote recebe uma lista de entradas e devolve uma lista de saídas,
+# na mesma ordem. Erros são reportados por item (campo `erro` de cada saída).
+# Os itens chegam crus e são validados um a um no cálculo do lote: um item inválido
+# vira um `erro` na sua saída, em vez de um 422 para o lote inteiro.
+ItemLote = Dict[str, Any]
+
+class IndicesFisicosBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de IndicesFisicosInput")
+
+class IndicesFisicosBatchOutput(BaseModel):
+    resultados: List[IndicesFisicosOutput]
+
+class LimitesConsistenciaBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de LimitesConsistenciaInput")
+
+class LimitesConsistenciaBatchOutput(BaseModel):
+    resultados: List[LimitesConsistenciaOutput]
+
+class CompactacaoBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de CompactacaoInput")
+
+class CompactacaoBatchOutput(BaseModel):
+    resultados: List[CompactacaoOutput]
+
+class TensoesGeostaticasBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de TensoesGeostaticasInput")
+
+class TensoesGeostaticasBatchOutput(BaseModel):
+    resultados: List[TensoesGeostaticasOutput]
+
+class AcrescimoTensoesBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de AcrescimoTensoesInput")
+
+class AcrescimoTensoesBatchOutput(BaseModel):
+    resultados: List[AcrescimoTensoesOutput]
+
+class RecalqueAdensamentoBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de RecalqueAdensamentoInput")
+
+class RecalqueAdensamentoBatchOutput(BaseModel):
+    resultados: List[RecalqueAdensamentoOutput]
+
+class TempoAdensamentoBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de TempoAdensamentoInput")
+
+class TempoAdensamentoBatchOutput(BaseModel):
+    resultados: List[TempoAdensamentoOutput]
+
+class ClassificacaoUSCSBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de ClassificacaoUSCSInput")
+
+class ClassificacaoUSCSBatchOutput(BaseModel):
+    resultados: List[ClassificacaoUSCSOutput]
+
+class FluxoHidraulicoBatchInput(BaseModel):
+    model_config = CONFIG_ENTRADA
+
+    itens: List[ItemLote] = Field(..., min_length=1, description="Entradas de FluxoHidraulicoInput")
+
+class FluxoHidraulicoBatchOutput(BaseModel):
+    resultados: List[FluxoHidraulicoOutput]
@@ -0,0 +1,21 @@
+# backend/app/modules/_arredondamento.py
+"""
+Arredondamento vetorizado dos resultados com o mesmo resultado do round() do Python,
+usado nos perfis calculados de uma vez com NumPy (tensões geostáticas e sob fluxo).
+"""
+import numpy as np
+
+
+def arredondar_casas(valores: np.ndarray, casas: int) -> None:
+    """ Arredonda `valores` a `casas` casas decimais no próprio array, como round(v, casas). """
+    escala = 10.0 ** casas
+    escalados = valores * escala
+    # rint(x * 10**casas) / 10**casas só difere do round() do Python perto do meio entre duas casas
+    # (o produto também é arredondado e o rint desempata para o par, ex.: np.round(64.2555, 3) dá
+    # 64.256 e round() dá 64.255): esses poucos valores passam pelo round()
+    fracoes = escalados - np.floor(escalados)
+    duvidosos = (np.abs(fracoes - 0.5) < 1e-6) | (np.abs(escalados) >= 1e9)
+    originais = valores[duvidosos].tolist()
+    np.divide(np.rint(escalados, out=escalados), escala, out=valores)
+    if originais:
+        valores[duvidosos] = [round(v, casas) for v in originais]
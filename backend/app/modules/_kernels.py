@@ -0,0 +1,236 @@
+# backend/app/modules/_kernels.py
+"""
+Núcleos numéricos (apenas floats) dos cálculos de acréscimo de tensões, compactação, fluxo,
+tensões geostáticas e adensamento.
+Compilados com Numba quando disponível; caso contrário rodam como Python puro.
+Ficam num módulo separado para que o custo de compilação/carregamento seja pago uma única vez.
+
+Os núcleos escalares e o perfil geostático podem ainda vir pré-compilados (AOT) do módulo nativo
+`app.modules.acrescimo_kernels`, gerado por `python build_kernels.py`; assim o worker
+não paga o JIT na partida. Sem ele, valem as versões JIT/Python abaixo.
+"""
+import math
+
+try:
+    from numba import njit, prange
+    NUMBA_DISPONIVEL = True
+except ImportError:  # Numba é opcional: sem ele os núcleos rodam no interpretador
+    NUMBA_DISPONIVEL = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorador(funcao):
+            return funcao
+        return decorador
+
+PI = math.pi
+EPSILON = 1e-9
+# Constantes das fórmulas, dobradas uma única vez
+COEF_BOUSSINESQ = 3.0 / (2.0 * PI)
+INV_PI = 1.0 / PI
+
+
+@njit('float64(float64,float64,float64,float64,float64,float64)', cache=True, fastmath=True)
+def _boussinesq_pontual(P, xc, yc, px, py, pz):
+    """ Δσv = (3P / 2π) * z³ / R⁵ para a carga P em (xc, yc) e o ponto (px, py, pz). """
+    dx = px - xc
+    dy = py - yc
+    denominador_raiz = dx*dx + dy*dy + pz*pz
+    if denominador_raiz <= EPSILON:
+        return math.nan
+    # R⁵ = (R²)² * √(R²): uma raiz e multiplicações em vez de pow()
+    return COEF_BOUSSINESQ * P * (pz*pz*pz) / (denominador_raiz*denominador_raiz*math.sqrt(denominador_raiz))
+
+
+@njit('float64(float64,float64,float64,float64)', cache=True, fastmath=True)
+def _carothers_faixa(b, p, x, z):
+    """ Δσv = (p / π) * (Δα + sin(Δα) * cos(Σα)) para a faixa de largura b e o ponto (x, z). """
+    if z <= EPSILON:
+        return p if abs(x) < 0.5*b else 0.0 # Na superfície
+    # Distâncias horizontais às bordas direita (x = b/2) e esquerda (x = -b/2)
+    dist_borda_dir = 0.5*b - x
+    dist_borda_esq = -0.5*b - x
+    # atan2(d, z) = atan(d / z) para z > 0, sem a divisão
+    alpha1 = math.atan2(dist_borda_dir, z)
+    alpha2 = math.atan2(dist_borda_esq, z)
+    delta_alpha = alpha1 - alpha2
+    sum_alpha = alpha1 + alpha2
+    return INV_PI * p * (delta_alpha + math.sin(delta_alpha) * math.cos(sum_alpha))
+
+
+@njit('float64(float64,float64,float64)', cache=True, fastmath=True)
+def _love_circular_centro(R, p, z):
+    """ Δσv = p * [1 - (1 / (1 + (R/z)²))^(3/2)] sob o centro da área circular de raio R. """
+    if z <= EPSILON:
+        return p # Na superfície
+    if R <= EPSILON:
+        return 0.0 # Raio zero
+    termo_base = 1.0 / (1.0 + (R / z)*(R / z))
+    # Base quase zero: evita underflow na potência
+    if termo_base < EPSILON:
+        return p
+    return p * (1.0 - termo_base*math.sqrt(termo_base)) # termo_base^(3/2)
+
+
+# --- Grades de pontos (mapas de tensão) ---
+# Laço externo paralelo com prange: cada ponto/linha é independente. Só compensam compilados;
+# sem Numba, os chamadores usam as versões vetorizadas com NumPy.
+
+@njit(parallel=True, cache=True, fastmath=True)
+def boussinesq_pontual_grade(P, xc, yc, xs, ys, zs, out):
+    """ Preenche out[i] com Δσv de Boussinesq no ponto (xs[i], ys[i], zs[i]). """
+    for i in prange(xs.size):
+        out[i] = _boussinesq_pontual(P, xc, yc, xs[i], ys[i], zs[i])
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def carothers_faixa_grade(b, p, zs, xs, out):
+    """ Preenche out[i, j] com Δσv de Carothers na profundidade zs[i] e posição xs[j]. """
+    for i in prange(zs.size):
+        for j in range(xs.size):
+            out[i, j] = _carothers_faixa(b, p, xs[j], zs[i])
+
+
+# --- Compactação: máximo da curva ajustada ---
+
+@njit('UniTuple(float64,2)(float64,float64,float64,float64,float64,float64)', cache=True, fastmath=True)
+def maximo_polinomio_cubico(a, b, c, d, w_min, w_max):
+    """
+    Máximo local de f(w) = a·w³ + b·w² + c·w + d (a = 0 para a parábola) em [w_min, w_max],
+    em forma fechada: raiz de f'(w) = 3a·w² + 2b·w + c com f''(w) < 0.
+    Retorna (w, f(w)), ou (nan, nan) se não houver máximo no intervalo.
+    """
+    A = 3.0 * a
+    B = 2.0 * b
+    if A == 0.0: # Parábola: vértice, se a concavidade for para baixo
+        if B >= 0.0:
+            return math.nan, math.nan
+        w = -c / B
+    else:
+        delta = B*B - 4.0*A*c
+        if delta <= 0.0: # Sem pontos críticos distintos: sem máximo
+            return math.nan, math.nan
+        # Raízes pela forma numericamente estável da fórmula de Bhaskara
+        q = -0.5 * (B + math.copysign(math.sqrt(delta), B))
+        w = q / A
+        if 2.0*A*w + B >= 0.0: # f''(w) ≥ 0: o máximo é a outra raiz
+            w = c / q
+    if w < w_min or w > w_max:
+        return math.nan, math.nan
+    return w, ((a*w + b)*w + c)*w + d # Horner
+
+
+# --- Fluxo: tensões ao longo da zona de fluxo ---
+
+@njit(cache=True, fastmath=True)
+def tensoes_fluxo_perfil(espessuras, gamas_sat, zs, topo_fluxo, carga_total_topo, i_medio, gamma_w,
+                         sigma_v, pressao_neutra, tensao_efetiva_v, carga_total):
+    """
+    Preenche σv, u, σ'v e h_total nas profundidades zs (crescentes) da zona de fluxo.
+    Um único ponteiro percorre as camadas junto com os pontos: O(P + L), sem busca binária.
+    Pontos numa interface ficam na camada de cima; abaixo da última, usa-se a base dela.
+    """
+    n_camadas = espessuras.size
+    j = 0
+    topo = topo_fluxo # Topo da camada j
+    sigma_topo = 0.0 # σv acumulada no topo da camada j
+    for i in range(zs.size):
+        z = zs[i]
+        while j < n_camadas - 1 and topo + espessuras[j] + EPSILON < z:
+            topo += espessuras[j]
+            sigma_topo += gamas_sat[j] * espessuras[j]
+            j += 1
+        z_relativo = min(z - topo, espessuras[j])
+        sv = sigma_topo + gamas_sat[j] * z_relativo
+        h = carga_total_topo + i_medio * (z - topo_fluxo)
+        u = max(0.0, gamma_w * (h + z)) # Datum na superfície: Z_elev = -z
+        sigma_v[i] = sv
+        pressao_neutra[i] = u
+        tensao_efetiva_v[i] = max(0.0, sv - u)
+        carga_total[i] = h
+
+
+# --- Tensões geostáticas: perfil na base de cada camada ---
+
+@njit(cache=True)
+def _tensoes_geostaticas_perfil(espessuras, gamas_nat, gamas_sat, Kos, z_base, na, altura_capilar, gama_w,
+                               tensao_total, pressao_neutra, tensao_efetiva_v, tensao_efetiva_h):
+    """
+    Preenche σv, u, σ'v e σ'h na base de cada camada num único laço, sem arrays intermediários.
+    Os γ usados já foram validados (sem NaN). Sem fastmath: a soma acumulada segue a ordem do
+    np.cumsum e os resultados são idênticos aos da versão NumPy.
+    """
+    sigma_v = 0.0
+    topo = 0.0
+    for k in range(z_base.size):
+        base = z_base[k]
+        if base <= na: # Camada inteira acima do NA
+            sigma_v += espessuras[k] * gamas_nat[k]
+        elif topo >= na: # Camada inteira abaixo do NA
+            sigma_v += gamas_sat[k] * espessuras[k]
+        else: # Atravessada: γnat acima do NA e γsat abaixo
+            sigma_v += (na - topo) * gamas_nat[k] + gamas_sat[k] * (base - na)
+        # u = γw * (z - NA) abaixo do NA e na franja capilar (negativa), 0 acima dela
+        distancia_na = base - na
+        u = distancia_na * gama_w if distancia_na >= -altura_capilar else 0.0
+        sev = sigma_v - u
+        if sev < -1e-9: # Imprecisão numérica ou capilaridade muito alta
+            sev = 0.0
+        tensao_total[k] = sigma_v
+        pressao_neutra[k] = u
+        tensao_efetiva_v[k] = sev
+        tensao_efetiva_h[k] = sev * Kos[k]
+        topo = base
+
+
+# --- Adensamento: recalque primário ---
+
+# Códigos do caso de adensamento devolvidos por `recalque_adensamento_nucleo`
+ADENSAMENTO_NA, ADENSAMENTO_PA_RECOMPRESSAO, ADENSAMENTO_PA_VIRGEM, ADENSAMENTO_SUB = range(4)
+
+@njit('Tuple((float64,float64,float64,int64))(float64,float64,float64,float64,float64,float64,float64)',
+      cache=True, fastmath=True)
+def recalque_adensamento_nucleo(H0, e0, Cc, Cr, sigma_v0, sigma_vm, delta_sigma):
+    """
+    Recalque primário de Terzaghi para entradas já validadas (todas positivas, Δσ' >= 0).
+    Retorna (ΔH, εv, RPA, código do caso); o código é inteiro para o Numba não sair do modo nopython.
+    """
+    sigma_vf = sigma_v0 + delta_sigma
+    RPA = sigma_vm / sigma_v0
+    um_mais_e0 = 1.0 + e0
+    normalmente_adensado = abs(RPA - 1.0) < 0.1 # RPA ≈ 1
+    if RPA > 1.0 and not normalmente_adensado: # Pré-adensado
+        fator_cr = Cr / um_mais_e0
+        if sigma_vf <= sigma_vm: # Só recompressão
+            codigo = ADENSAMENTO_PA_RECOMPRESSAO
+            epsilon_v = fator_cr * math.log10(sigma_vf / sigma_v0)
+        else: # Recompressão até σvm' (log10(σvm'/σv0') = log10(RPA)) + trecho virgem
+            codigo = ADENSAMENTO_PA_VIRGEM
+            epsilon_v = fator_cr * math.log10(RPA) + (Cc / um_mais_e0) * math.log10(sigma_vf / sigma_vm)
+    else: # Normalmente adensado ou sub-adensado: todo o acréscimo na curva virgem
+        codigo = ADENSAMENTO_NA if normalmente_adensado else ADENSAMENTO_SUB
+        epsilon_v = (Cc / um_mais_e0) * math.log10(sigma_vf / sigma_v0)
+    return epsilon_v * H0, epsilon_v, RPA, codigo
+
+
+# --- Núcleos escalares públicos: AOT quando o módulo nativo existe, senão JIT/Python ---
+# (as grades acima sempre usam as versões JIT, que o Numba consegue chamar em modo nopython)
+
+try:
+    from app.modules import acrescimo_kernels as _aot
+except ImportError:
+    _aot = None
+
+if _aot is not None:
+    boussinesq_pontual = _aot.boussinesq_pontual
+    carothers_faixa = _aot.carothers_faixa
+    love_circular_centro = _aot.love_circular_centro
+    tensoes_geostaticas_perfil = _aot.tensoes_geostaticas_perfil
+else:
+    boussinesq_pontual = _boussinesq_pontual
+    carothers_faixa = _carothers_faixa
+    love_circular_centro = _love_circular_centro
+    tensoes_geostaticas_perfil = _tensoes_geostaticas_perfil
+
+# O perfil geostático compilado (AOT ou JIT) compensa sobre a versão NumPy; em Python puro, não
+PERFIL_GEOSTATICO_COMPILADO = _aot is not None or NUMBA_DISPONIVEL
@@ -1,26 +1,54 @@
 # backend/app/modules/acrescimo_tensoes.py
+import math
+import threading
+from bisect import bisect_left
+from operator import attrgetter
 import numpy as np
-from typing import Optional
+from typing import List, Optional, Tuple
+from app.cache import CacheLRU
 # Importa os modelos Pydantic do ficheiro centralizado
 from app.models import (
     PontoInteresse, CargaPontual, CargaFaixa, CargaCircular, # Adicionado CargaFaixa, CargaCircular
     AcrescimoTensoesInput, AcrescimoTensoesOutput
 )
-
-PI = np.pi
-EPSILON = 1e-9
+from app.log import logger
+# Constantes (EPSILON, coeficientes) vêm dos núcleos numéricos para que os dois módulos usem as mesmas constantes
+from app.modules._kernels import (
+    COEF_BOUSSINESQ, EPSILON, INV_PI, NUMBA_DISPONIVEL,
+    boussinesq_pontual, boussinesq_pontual_grade, carothers_faixa, carothers_faixa_grade, love_circular_centro,
+)
 
 # --- Funções de Cálculo Específicas ---
 
 def calcular_acrescimo_boussinesq_pontual(carga: CargaPontual, ponto: PontoInteresse) -> float:
     """ (Código inalterado) """
-    P = carga.P
-    z = ponto.z
-    r_quadrado = (ponto.x - carga.x)**2 + (ponto.y - carga.y)**2
-    denominador_raiz = r_quadrado + z**2
-    if denominador_raiz <= EPSILON: return float('nan')
-    delta_sigma_v = (3 * P * (z**3)) / (2 * PI * (denominador_raiz**2.5)) #
-    return delta_sigma_v
+    _, x_carga, y_carga, P = carga.tupla
+    return boussinesq_pontual(P, x_carga, y_carga, ponto.x, ponto.y, ponto.z)
+
+def calcular_acrescimo_boussinesq_pontual_batch(P: float, xc: float, yc: float, pts: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `calcular_acrescimo_boussinesq_pontual` para vários pontos.
+    `pts` é um array (N, 3) com as colunas x, y, z; a carga P está aplicada em (xc, yc).
+    Δσv = (3P / 2π) * z³ / R⁵, com R² = r² + z², avaliada de uma só vez com NumPy.
+    Pontos com R² ~ 0 resultam em NaN.
+    """
+    if NUMBA_DISPONIVEL: # Laço paralelo compilado sobre os pontos
+        out = np.empty(len(pts))
+        boussinesq_pontual_grade(P, xc, yc, pts[:, 0], pts[:, 1], pts[:, 2], out)
+        return out
+    dx = pts[:, 0] - xc
+    dy = pts[:, 1] - yc
+    z = pts[:, 2]
+    denominador_raiz = dx*dx + dy*dy + z*z
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # R⁵ = (R²)² * √(R²): uma raiz e multiplicações em vez de pow()
+        delta_sigma_v = COEF_BOUSSINESQ * P * (z*z*z) / (denominador_raiz*denominador_raiz*np.sqrt(denominador_raiz))
+    return np.where(denominador_raiz <= EPSILON, np.nan, delta_sigma_v)
+
+def calcular_acrescimo_boussinesq_pontual_pontos(carga: CargaPontual, pts: np.ndarray) -> np.ndarray:
+    """ Desempacota a carga e delega para `calcular_acrescimo_boussinesq_pontual_batch`. """
+    _, x_carga, y_carga, P = carga.tupla
+    return calcular_acrescimo_boussinesq_pontual_batch(P, x_carga, y_carga, pts)
 
 def calcular_acrescimo_carothers_faixa(carga: CargaFaixa, ponto: PontoInteresse) -> float:
     """
@@ -44,31 +72,46 @@ def calcular_acrescimo_carothers_faixa(carga: CargaFaixa, ponto: PontoInteresse)
     - PDF: 9. Tensões_devido_a_Sobrecarga-MAIO_2022.pdf (Pág. 15) - Cuidado com a definição dos ângulos.
     - Outras fontes de Mecânica dos Solos (ex: Das, Coduto)
     """
-    p = carga.intensidade
-    b = carga.largura # Largura total da faixa
-    x = ponto.x # Distância horizontal do ponto ao centro da faixa
-    z = ponto.z
+    _, b, p, _ = carga.tupla # b: largura total da faixa
+    # Ângulos das bordas: α1 (x = b/2) e α2 (x = -b/2); Δα = α1 - α2 equivale a 2α do PDF
+    # e Σα = α1 + α2 a 2β do PDF. Δσv = (p / π) * (sen(2α) * cos(2β) + 2α)
+    return carothers_faixa(b, p, ponto.x, ponto.z)
 
-    if z <= EPSILON: return p if abs(x) < b/2 else 0.0 # Na superfície
 
-    # Usando a formulação com ângulos das bordas α1 e α2
-    # α1: ângulo com a borda direita (x = b/2)
-    # α2: ângulo com a borda esquerda (x = -b/2)
-    alpha1 = np.arctan((b/2 - x) / z)
-    alpha2 = np.arctan((-b/2 - x) / z)
-
-    # Ângulo subentendido pela faixa no ponto P: delta_alpha = alpha1 - alpha2 (equivale a 2α do PDF)
+def _acrescimo_carothers_faixa_arrays(b: float, p: float, x: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """ Δσv de Carothers para arrays (já compatíveis por broadcasting) de posição x e profundidade z. """
+    alpha1 = np.arctan2(0.5*b - x, z)
+    alpha2 = np.arctan2(-0.5*b - x, z)
     delta_alpha = alpha1 - alpha2
-    # Ângulo relacionado à posição horizontal: sum_alpha = alpha1 + alpha2 (equivale a 2β do PDF)
-    sum_alpha = alpha1 + alpha2
+    # Forma a*b + c (sin·cos + Δα), escalada uma única vez por p/π
+    delta_sigma_v = (INV_PI * p) * (np.sin(delta_alpha) * np.cos(alpha1 + alpha2) + delta_alpha)
+    # Na superfície: p sob a faixa, 0 fora
+    return np.where(z <= EPSILON, np.where(np.abs(x) < 0.5*b, p, 0.0), delta_sigma_v)
 
-    # Aplicando a fórmula do PDF - Confirmar a convenção dos ângulos beta e alpha
-    # Δσv = (p / π) * (sen(2α) * cos(2β) + 2α)
-    # No PDF, 2α parece ser o ângulo subentendido e 2β o ângulo da bissetriz com a vertical
-    # Na nossa dedução: delta_alpha = 2α do PDF, sum_alpha = 2β do PDF
-    delta_sigma_v = (p / PI) * (delta_alpha + np.sin(delta_alpha) * np.cos(sum_alpha))
+def calcular_acrescimo_carothers_faixa_batch(b: float, p: float, pts: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `calcular_acrescimo_carothers_faixa` para um array (N, 3) de pontos
+    (a coordenada y é ignorada: a faixa é infinita nessa direção).
+    """
+    return _acrescimo_carothers_faixa_arrays(b, p, pts[:, 0], pts[:, 2])
 
-    return delta_sigma_v
+def calcular_acrescimo_carothers_faixa_grid(b: float, p: float, z_arr: np.ndarray, x_arr: np.ndarray) -> np.ndarray:
+    """
+    Δσv de Carothers numa grade de profundidades z_arr × posições x_arr (isóbaras sob a faixa),
+    numa única chamada vetorizada. Retorna um array (len(z_arr), len(x_arr)).
+    """
+    z = np.asarray(z_arr, dtype=np.float64)
+    x = np.asarray(x_arr, dtype=np.float64)
+    if NUMBA_DISPONIVEL: # Laço paralelo compilado sobre as linhas (profundidades)
+        out = np.empty((z.size, x.size))
+        carothers_faixa_grade(b, p, z, x, out)
+        return out
+    return _acrescimo_carothers_faixa_arrays(b, p, x[None, :], z[:, None])
+
+def calcular_acrescimo_carothers_faixa_pontos(carga: CargaFaixa, pts: np.ndarray) -> np.ndarray:
+    """ Desempacota a carga e delega para `calcular_acrescimo_carothers_faixa_batch`. """
+    _, b, p, _ = carga.tupla
+    return calcular_acrescimo_carothers_faixa_batch(b, p, pts)
 
 
 def calcular_acrescimo_love_circular_centro(carga: CargaCircular, ponto: PontoInteresse) -> float:
@@ -85,22 +128,82 @@ def calcular_acrescimo_love_circular_centro(carga: CargaCircular, ponto: PontoIn
     Referências:
     - PDF: 9. Tensões_devido_a_Sobrecarga-MAIO_2022.pdf (Pág. 17)
     """
-    p = carga.intensidade
-    R = carga.raio
-    z = ponto.z
-
-    if z <= EPSILON: return p # Na superfície
-    if R <= EPSILON: return 0.0 # Raio zero
-
-    rz_ratio_sq = (R / z)**2
-    termo_base = 1 / (1 + rz_ratio_sq)
-    # Verifica se a base da potência é muito pequena para evitar underflow ou NaN
-    if termo_base < EPSILON and 1.5 > 0: # Base quase zero e expoente positivo
-        delta_sigma_v = p * (1.0 - 0.0)
+    _, R, p, _, _ = carga.tupla
+    return love_circular_centro(R, p, ponto.z)
+
+# --- Ábaco de Love (carga circular) ---
+
+# Dados aproximados do ábaco (extraídos visualmente ou de tabela externa), em arrays contíguos:
+# _Z_R (linhas), _R_R (colunas) e _SIGMA_P[i, j] = σz/p para z/R = _Z_R[i] e r/R = _R_R[j]
+_Z_R = np.array([0.5, 1.0, 1.5, 2.0, 3.0])
+_R_R = np.array([0.0, 0.5, 0.75, 1.0, 1.25, 1.5])
+_SIGMA_P = np.array([
+    [0.91, 0.85, 0.75, 0.50, 0.23, 0.10],
+    [0.65, 0.60, 0.52, 0.37, 0.22, 0.12],
+    [0.42, 0.40, 0.36, 0.29, 0.20, 0.13],
+    [0.29, 0.28, 0.26, 0.22, 0.17, 0.12],
+    [0.14, 0.14, 0.13, 0.12, 0.10, 0.08],
+    # Adicionar mais linhas ou usar interpolação mais sofisticada
+])
+# Invariantes da tabela, calculados uma única vez: último índice de célula e espaçamentos
+_I_MAX_Z = len(_Z_R) - 2
+_J_MAX_R = len(_R_R) - 2
+_DZ_R = np.diff(_Z_R)
+_DR_R = np.diff(_R_R)
+# Cópias como floats do Python para o caminho escalar (bisect e aritmética sem NumPy)
+_Z_R_LISTA = _Z_R.tolist()
+_DZ_R_LISTA = _DZ_R.tolist()
+
+# Buffers de trabalho (uma linha do ábaco) reutilizados entre chamadas; um par por thread,
+# já que os cálculos rodam no threadpool
+_LOCAL_ABACO = threading.local()
+
+def _buffers_abaco() -> Tuple[np.ndarray, np.ndarray]:
+    """ Retorna (curva, auxiliar) da thread atual, criados no primeiro acesso. """
+    buffers = getattr(_LOCAL_ABACO, 'buffers', None)
+    if buffers is None:
+        buffers = _LOCAL_ABACO.buffers = (np.empty(_R_R.size), np.empty(_R_R.size))
+    return buffers
+
+def _interpolar_abaco(z_R: float, r_R: float) -> float:
+    """ Interpolação bilinear de σz/p na tabela do ábaco, limitada às bordas em z/R e r/R. """
+    # Curvas z/R que envolvem o ponto (iguais nas bordas do ábaco)
+    i_sup = min(bisect_left(_Z_R_LISTA, z_R), _I_MAX_Z + 1)
+    i_inf = max(i_sup - 1, 0) if z_R < _Z_R_LISTA[i_sup] else i_sup
+    if i_inf == i_sup:
+        curva = _SIGMA_P[i_inf]
     else:
-        delta_sigma_v = p * (1 - termo_base**1.5)
-
-    return delta_sigma_v
+        # Curva interpolada montada nos buffers da thread, sem alocar arrays novos
+        curva, auxiliar = _buffers_abaco()
+        peso_sup = (z_R - _Z_R_LISTA[i_inf]) / _DZ_R_LISTA[i_inf]
+        np.multiply(_SIGMA_P[i_inf], 1.0 - peso_sup, out=curva)
+        np.multiply(_SIGMA_P[i_sup], peso_sup, out=auxiliar)
+        np.add(curva, auxiliar, out=curva)
+    return float(np.interp(r_R, _R_R, curva))
+
+# O fator de influência só depende de (z/R, r/R): consultas repetidas (ex.: o usuário ajustando
+# p ou refazendo o mesmo cálculo) saem do cache
+_CACHE_ABACO = CacheLRU()
+
+def _fator_influencia_abaco(z_R: float, r_R: float) -> float:
+    """ σz/p do ábaco para (z/R, r/R), memorizado num cache LRU. """
+    chave = (z_R, r_R)
+    fator = _CACHE_ABACO.obter(chave)
+    if fator is None:
+        fator = _interpolar_abaco(z_R, r_R)
+        _CACHE_ABACO.guardar(chave, fator)
+    return fator
+
+def _interpolar_abaco_arrays(z_R: np.ndarray, r_R: np.ndarray) -> np.ndarray:
+    """ Versão vetorizada de `_interpolar_abaco` (arrays com broadcasting entre z/R e r/R). """
+    # Índices da célula (i, j) e pesos em cada direção, limitados às bordas do ábaco
+    i = np.clip(np.searchsorted(_Z_R, z_R, side='right') - 1, 0, _I_MAX_Z)
+    j = np.clip(np.searchsorted(_R_R, r_R, side='right') - 1, 0, _J_MAX_R)
+    peso_z = np.clip((z_R - _Z_R[i]) / _DZ_R[i], 0.0, 1.0)
+    peso_r = np.clip((r_R - _R_R[j]) / _DR_R[j], 0.0, 1.0)
+    curva_inf = (1.0 - peso_r) * _SIGMA_P[i, j] + peso_r * _SIGMA_P[i, j + 1]
+    curva_sup = (1.0 - peso_r) * _SIGMA_P[i + 1, j] + peso_r * _SIGMA_P[i + 1, j + 1]
+    return (1.0 - peso_z) * curva_inf + peso_z * curva_sup
 
 # Função para usar o Ábaco de Love (simplificado)
 def calcular_acrescimo_love_circular_abaco(carga: CargaCircular, ponto: PontoInteresse) -> Optional[float]:
@@ -108,10 +211,9 @@ def calcular_acrescimo_love_circular_abaco(carga: CargaCircular, ponto: PontoInt
     Estima o acréscimo de tensão vertical (Δσv) usando uma
     aproximação digital do ábaco de Love (Fig. Pág 18 do PDF 9).
     """
-    p = carga.intensidade
-    R = carga.raio
+    _, R, p, _, _ = carga.tupla
     z = ponto.z
-    r = np.sqrt(ponto.x**2 + ponto.y**2) # Distância radial do centro
+    r = math.hypot(ponto.x, ponto.y) # Distância radial do centro
 
     if z <= EPSILON: return p if r < R else 0.0
     if R <= EPSILON: return 0.0
@@ -119,119 +221,100 @@ def calcular_acrescimo_love_circular_abaco(carga: CargaCircular, ponto: PontoInt
     z_R = z / R
     r_R = r / R
 
-    # Dados aproximados do ábaco (extraídos visualmente ou de tabela externa)
-    # Formato: { z/R: [(r/R, sigma_z/p), ...], ... }
-    abaco_data = {
-        0.5: [(0, 0.91), (0.5, 0.85), (0.75, 0.75), (1.0, 0.50), (1.25, 0.23), (1.5, 0.10)],
-        1.0: [(0, 0.65), (0.5, 0.60), (0.75, 0.52), (1.0, 0.37), (1.25, 0.22), (1.5, 0.12)],
-        1.5: [(0, 0.42), (0.5, 0.40), (0.75, 0.36), (1.0, 0.29), (1.25, 0.20), (1.5, 0.13)],
-        2.0: [(0, 0.29), (0.5, 0.28), (0.75, 0.26), (1.0, 0.22), (1.25, 0.17), (1.5, 0.12)],
-        3.0: [(0, 0.14), (0.5, 0.14), (0.75, 0.13), (1.0, 0.12), (1.25, 0.10), (1.5, 0.08)],
-        # Adicionar mais pontos ou usar interpolação mais sofisticada
-    }
-
-    # Interpolação Bilinear Simples
-    z_R_keys = sorted(abaco_data.keys())
-    # Encontra z/R inferior e superior no ábaco
-    z_R_inf = max([k for k in z_R_keys if k <= z_R], default=min(z_R_keys))
-    z_R_sup = min([k for k in z_R_keys if k >= z_R], default=max(z_R_keys))
-
-    if z_R_inf == z_R_sup: # z/R exato no ábaco
-        curva = abaco_data[z_R_inf]
-    else: # Interpola linearmente entre as curvas z/R
-        curva_inf = abaco_data[z_R_inf]
-        curva_sup = abaco_data[z_R_sup]
-        # Pondera pela distância relativa a z/R
-        peso_sup = (z_R - z_R_inf) / (z_R_sup - z_R_inf)
-        peso_inf = 1.0 - peso_sup
-        # Interpola os valores de sigma_z/p para cada r/R
-        # Assume que ambas as curvas têm os mesmos pontos r/R (pode precisar de ajuste)
-        curva = []
-        for i in range(len(curva_inf)):
-            r_R_val = curva_inf[i][0]
-            sigma_p_inf = curva_inf[i][1]
-            # Encontra o ponto correspondente na curva superior
-            sigma_p_sup = next((p[1] for p in curva_sup if np.isclose(p[0], r_R_val)), sigma_p_inf) # Usa valor inf se não achar
-            sigma_p_interp = peso_inf * sigma_p_inf + peso_sup * sigma_p_sup
-            curva.append((r_R_val, sigma_p_interp))
-
-    # Agora, interpola linearmente na curva resultante para o r/R do ponto
-    r_R_vals = [p[0] for p in curva]
-    sigma_p_vals = [p[1] for p in curva]
-
-    if r_R >= r_R_vals[-1]: # Fora do ábaco (à direita)
-        # Pode extrapolar ou retornar o último valor/zero? Retornar o último valor por segurança.
-        fator_I = sigma_p_vals[-1]
-    elif r_R <= r_R_vals[0]: # Fora do ábaco (à esquerda - centro)
-        fator_I = sigma_p_vals[0]
-    else: # Interpola linearmente
-        fator_I = np.interp(r_R, r_R_vals, sigma_p_vals)
+    # Interpolação bilinear na tabela pré-montada (valores fora do ábaco são limitados às bordas)
+    fator_I = _fator_influencia_abaco(z_R, r_R)
 
     if fator_I < 0: fator_I = 0.0 # Garante não-negativo
 
     delta_sigma_v = p * fator_I
     return delta_sigma_v
 
+def _acrescimo_love_circular_abaco_arrays(R: float, p: float, z: np.ndarray, r: np.ndarray) -> np.ndarray:
+    """ Δσv pelo ábaco para arrays (já compatíveis por broadcasting) de profundidade z e distância radial r. """
+    if R <= EPSILON:
+        return np.zeros(np.broadcast(z, r).shape)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fator_I = np.maximum(_interpolar_abaco_arrays(z / R, r / R), 0.0) # Garante não-negativo
+    # Na superfície: p dentro da área carregada, 0 fora
+    return np.where(z <= EPSILON, np.where(r < R, p, 0.0), p * fator_I)
+
+def calcular_acrescimo_love_circular_abaco_grid(R: float, p: float, z_arr: np.ndarray, r_arr: np.ndarray) -> np.ndarray:
+    """
+    Δσv pelo ábaco de Love numa grade de profundidades z_arr × distâncias radiais r_arr,
+    numa única chamada vetorizada. Retorna um array (len(z_arr), len(r_arr)).
+    """
+    z = np.asarray(z_arr, dtype=np.float64)[:, None]
+    r = np.asarray(r_arr, dtype=np.float64)[None, :]
+    return _acrescimo_love_circular_abaco_arrays(R, p, z, r)
+
+def calcular_acrescimo_love_circular_abaco_pontos(carga: CargaCircular, pts: np.ndarray) -> np.ndarray:
+    """ Versão vetorizada de `calcular_acrescimo_love_circular_abaco` para um array (N, 3) de pontos. """
+    _, R, p, _, _ = carga.tupla
+    r = np.hypot(pts[:, 0], pts[:, 1]) # Distância radial do centro
+    return _acrescimo_love_circular_abaco_arrays(R, p, pts[:, 2], r)
+
 # --- Função Principal do Módulo ---
 
+# tipo da carga -> (cálculo num ponto, cálculo vetorizado sobre array (N, 3), método)
+_DESPACHO = {
+    'pontual': (calcular_acrescimo_boussinesq_pontual, calcular_acrescimo_boussinesq_pontual_pontos, "Boussinesq (Pontual)"),
+    'faixa': (calcular_acrescimo_carothers_faixa, calcular_acrescimo_carothers_faixa_pontos, "Carothers (Faixa)"),
+    # Usar ábaco para pontos fora do centro (sob o centro, `calcular_acrescimo_love_circular_centro` é exato)
+    'circular': (calcular_acrescimo_love_circular_abaco, calcular_acrescimo_love_circular_abaco_pontos, "Love (Circular - Ábaco)"),
+    # 'retangular': implementação futura usando Newmark (integração ou ábaco digitalizado)
+}
+
+# (x, y, z) de um PontoInteresse, extraídos como tupla em C
+_COORDENADAS = attrgetter('x', 'y', 'z')
+
 def calcular_acrescimo_tensoes(dados: AcrescimoTensoesInput) -> AcrescimoTensoesOutput:
     """
     Calcula o acréscimo de tensão vertical com base no tipo de carga especificado.
     Suporta: 'pontual', 'faixa', 'circular'.
     """
     try:
-        tipo = dados.tipo_carga.lower()
+        carga = dados.carga
         ponto = dados.ponto_interesse
+        pontos = dados.pontos_interesse
 
-        if ponto.z <= EPSILON:
+        if ponto is None and not pontos:
+            raise ValueError("Forneça 'ponto_interesse' ou 'pontos_interesse'.")
+        if (ponto is not None and ponto.z <= EPSILON) or (pontos and any(p.z <= EPSILON for p in pontos)):
              raise ValueError("Profundidade (z) do ponto de interesse deve ser maior que zero.")
 
-        delta_sigma: Optional[float] = None
-        metodo: Optional[str] = None
-
-        if tipo == "pontual":
-            if dados.carga_pontual is None: raise ValueError("Dados de 'carga_pontual' necessários.")
-            delta_sigma = calcular_acrescimo_boussinesq_pontual(dados.carga_pontual, ponto)
-            metodo = "Boussinesq (Pontual)"
-
-        elif tipo == "faixa":
-            if dados.carga_faixa is None: raise ValueError("Dados de 'carga_faixa' necessários.")
-            delta_sigma = calcular_acrescimo_carothers_faixa(dados.carga_faixa, ponto)
-            metodo = "Carothers (Faixa)"
-
-        elif tipo == "circular":
-            if dados.carga_circular is None: raise ValueError("Dados de 'carga_circular' necessários.")
-            # Usar ábaco para pontos fora do centro
-            delta_sigma = calcular_acrescimo_love_circular_abaco(dados.carga_circular, ponto)
-            metodo = "Love (Circular - Ábaco)"
-            # Se fosse apenas no centro:
-            # if abs(ponto.x) > EPSILON or abs(ponto.y) > EPSILON:
-            #     return AcrescimoTensoesOutput(metodo="Love (Circular)", erro="Cálculo fora do centro requer ábaco/métodos numéricos (não implementado).")
-            # else:
-            #     delta_sigma = calcular_acrescimo_love_circular_centro(dados.carga_circular, ponto)
-            #     metodo = "Love (Circular - Centro)"
-
-        # elif tipo == "retangular":
-             # Implementação futura usando Newmark (integração ou ábaco digitalizado)
-             # return AcrescimoTensoesOutput(erro="Cálculo para carga retangular ainda não implementado.")
-
-        else:
-            return AcrescimoTensoesOutput(erro=f"Tipo de carga '{dados.tipo_carga}' não suportado.")
-
-        # --- Processamento do Resultado ---
+        # Despacho pelo discriminador da carga (a união discriminada garante um dos três)
+        despacho = _DESPACHO.get(carga.tipo)
+        if despacho is None:
+            return AcrescimoTensoesOutput.model_construct(erro=f"Tipo de carga '{dados.tipo_carga}' não suportado.")
+        calcular_ponto, calcular_pontos, metodo = despacho
+
+        # --- Vários pontos ---
+        delta_sigma_pontos: Optional[List[Optional[float]]] = None
+        if pontos:
+            # Os modelos já foram validados: daqui em diante só arrays (N, 3) de x, y, z
+            pts = np.array(list(map(_COORDENADAS, pontos)), dtype=np.float64)
+            valores = calcular_pontos(carga, pts)
+            delta_sigma_pontos = [None if math.isnan(v) else v for v in valores.tolist()]
+
+        if ponto is None:
+            # Lista de floats gerada aqui mesmo: model_construct dispensa validar item a item
+            return AcrescimoTensoesOutput.model_construct(delta_sigma_v_pontos=delta_sigma_pontos, metodo=metodo)
+
+        # --- Processamento do Resultado (ponto único) ---
+        delta_sigma = calcular_ponto(carga, ponto)
         if delta_sigma is None:
-             return AcrescimoTensoesOutput(metodo=metodo, erro="Falha no cálculo interno.")
-        elif np.isnan(delta_sigma):
-             return AcrescimoTensoesOutput(metodo=metodo, erro="Cálculo resultou em valor indefinido (NaN). Verifique os dados.")
+             return AcrescimoTensoesOutput.model_construct(metodo=metodo, erro="Falha no cálculo interno.")
+        elif math.isnan(delta_sigma):
+             return AcrescimoTensoesOutput.model_construct(metodo=metodo, erro="Cálculo resultou em valor indefinido (NaN). Verifique os dados.")
         else:
-            return AcrescimoTensoesOutput(
-                delta_sigma_v=round(delta_sigma, 4),
+            return AcrescimoTensoesOutput.model_construct(
+                delta_sigma_v=delta_sigma, # Arredondado na serialização
+                delta_sigma_v_pontos=delta_sigma_pontos,
                 metodo=metodo
             )
 
     except ValueError as ve:
-        return AcrescimoTensoesOutput(erro=str(ve))
+        return AcrescimoTensoesOutput.model_construct(erro=str(ve))
     except Exception as e:
-        import traceback
-        print(f"Erro inesperado no cálculo de acréscimo de tensões: {e}\n{traceback.format_exc()}")
-        return AcrescimoTensoesOutput(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("Erro inesperado no cálculo de acréscimo de tensões: %s", e)
+        return AcrescimoTensoesOutput.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
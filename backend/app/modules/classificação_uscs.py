@@ -1,10 +1,85 @@
 # backend/app/modules/classificacao_uscs.py
-from typing import Dict, Optional, Tuple
+from typing import Dict, Final, Literal, Tuple
 # Importa os modelos Pydantic definidos em app/models.py
 from app.models import ClassificacaoUSCSInput, ClassificacaoUSCSOutput
+from app.log import logger
 
 EPSILON = 1e-9
 
+# --- Tabela de decisão USCS ---
+# Chaves: (faixa de finos, é pedregulho, bem graduado, tipo do fino) para solos grossos e
+# (faixa de finos, prefixo M/C/O, sufixo L/H) para solos finos -> (classificação, descrição)
+_POUCOS_FINOS, _DUPLA, _MUITOS_FINOS, _FINO = range(4) # < 5%, 5-12%, > 12%, >= 50% passando #200
+
+# Descrições de cada grupo: constantes reutilizadas em todas as respostas
+_DESC_PT: Final[str] = "Turfa e outros solos altamente orgânicos"
+_DESC_GW: Final[str] = "Pedregulho bem graduado(a), com pouca ou nenhuma finos"
+_DESC_GP: Final[str] = "Pedregulho mal graduado(a), com pouca ou nenhuma finos"
+_DESC_SW: Final[str] = "Areia bem graduado(a), com pouca ou nenhuma finos"
+_DESC_SP: Final[str] = "Areia mal graduado(a), com pouca ou nenhuma finos"
+_DESC_GW_GM: Final[str] = "Pedregulho bem graduado(a) com silte"
+_DESC_GW_GC: Final[str] = "Pedregulho bem graduado(a) com argila"
+_DESC_GP_GM: Final[str] = "Pedregulho mal graduado(a) com silte"
+_DESC_GP_GC: Final[str] = "Pedregulho mal graduado(a) com argila"
+_DESC_SW_SM: Final[str] = "Areia bem graduado(a) com silte"
+_DESC_SW_SC: Final[str] = "Areia bem graduado(a) com argila"
+_DESC_SP_SM: Final[str] = "Areia mal graduado(a) com silte"
+_DESC_SP_SC: Final[str] = "Areia mal graduado(a) com argila"
+_DESC_GM: Final[str] = "Pedregulho siltoso(a)"
+_DESC_GC: Final[str] = "Pedregulho argiloso(a)"
+_DESC_SM: Final[str] = "Areia siltoso(a)"
+_DESC_SC: Final[str] = "Areia argiloso(a)"
+_DESC_ML: Final[str] = "Silte de baixa plasticidade/compressibilidade"
+_DESC_MH: Final[str] = "Silte de alta plasticidade/compressibilidade"
+_DESC_CL: Final[str] = "Argila de baixa plasticidade/compressibilidade"
+_DESC_CH: Final[str] = "Argila de alta plasticidade/compressibilidade"
+_DESC_OL: Final[str] = "Solo Orgânico de baixa plasticidade/compressibilidade"
+_DESC_OH: Final[str] = "Solo Orgânico de alta plasticidade/compressibilidade"
+
+_TABELA_USCS: Final[Dict[tuple, Tuple[str, str]]] = {
+    # Poucos finos (< 5%): (faixa, é pedregulho, bem graduado, None)
+    (_POUCOS_FINOS, True, True, None): ("GW", _DESC_GW),
+    (_POUCOS_FINOS, True, False, None): ("GP", _DESC_GP),
+    (_POUCOS_FINOS, False, True, None): ("SW", _DESC_SW),
+    (_POUCOS_FINOS, False, False, None): ("SP", _DESC_SP),
+    # Classificação dupla (5-12%): (faixa, é pedregulho, bem graduado, tipo do fino)
+    (_DUPLA, True, True, "M"): ("GW-GM", _DESC_GW_GM),
+    (_DUPLA, True, True, "C"): ("GW-GC", _DESC_GW_GC),
+    (_DUPLA, True, False, "M"): ("GP-GM", _DESC_GP_GM),
+    (_DUPLA, True, False, "C"): ("GP-GC", _DESC_GP_GC),
+    (_DUPLA, False, True, "M"): ("SW-SM", _DESC_SW_SM),
+    (_DUPLA, False, True, "C"): ("SW-SC", _DESC_SW_SC),
+    (_DUPLA, False, False, "M"): ("SP-SM", _DESC_SP_SM),
+    (_DUPLA, False, False, "C"): ("SP-SC", _DESC_SP_SC),
+    # Muitos finos (> 12%): (faixa, é pedregulho, None, tipo do fino)
+    (_MUITOS_FINOS, True, None, "M"): ("GM", _DESC_GM),
+    (_MUITOS_FINOS, True, None, "C"): ("GC", _DESC_GC),
+    (_MUITOS_FINOS, False, None, "M"): ("SM", _DESC_SM),
+    (_MUITOS_FINOS, False, None, "C"): ("SC", _DESC_SC),
+    # Solos finos (>= 50%): (faixa, prefixo M/C/O, sufixo L/H)
+    (_FINO, "M", "L"): ("ML", _DESC_ML),
+    (_FINO, "M", "H"): ("MH", _DESC_MH),
+    (_FINO, "C", "L"): ("CL", _DESC_CL),
+    (_FINO, "C", "H"): ("CH", _DESC_CH),
+    (_FINO, "O", "L"): ("OL", _DESC_OL),
+    (_FINO, "O", "H"): ("OH", _DESC_OH),
+}
+
+# Respostas prontas: o resultado de cada grupo é fixo, então é validado uma única vez no import
+_RESULTADO_PT: Final = ClassificacaoUSCSOutput(classificacao="Pt", descricao=_DESC_PT)
+_RESULTADOS_USCS: Final[Dict[tuple, ClassificacaoUSCSOutput]] = {
+    chave: ClassificacaoUSCSOutput(classificacao=classificacao, descricao=descricao)
+    for chave, (classificacao, descricao) in _TABELA_USCS.items()
+}
+
+# Cu mínimo para solo bem graduado, indexado por `is_pedregulho`: areia (SW) 6, pedregulho (GW) 4
+_CU_MINIMO: Final[Tuple[float, float]] = (6.0, 4.0)
+
+def _bem_graduado(is_pedregulho: bool, Cu: float, Cc: float) -> bool:
+    """ Critério de graduação: GW (Cu >= 4) ou SW (Cu >= 6), ambos com 1 <= Cc <= 3. """
+    # Limiar por indexação e `&` entre os dois critérios: sem desvios condicionais
+    return (Cu >= _CU_MINIMO[is_pedregulho]) & (1.0 <= Cc) & (Cc <= 3.0)
+
 def classificar_uscs(dados: ClassificacaoUSCSInput) -> ClassificacaoUSCSOutput:
     """
     Classifica o solo de acordo com o Sistema Unificado de Classificação de Solos (USCS).
@@ -34,42 +109,24 @@ def classificar_uscs(dados: ClassificacaoUSCSInput) -> ClassificacaoUSCSOutput:
             raise ValueError("Percentagem passando na #200 deve estar entre 0 e 100.")
         if not (0 <= pass_peneira_4 <= 100):
             raise ValueError("Percentagem passando na #4 deve estar entre 0 e 100.")
-        if pass_peneira_200 > pass_peneira_4:
-             raise ValueError("Percentagem passando na #200 não pode ser maior que a #4.")
 
         # --- Verificação Inicial: Solo Altamente Orgânico (Turfa) ---
         if is_altamente_organico:
-             return ClassificacaoUSCSOutput(
-                 classificacao="Pt",
-                 descricao="Turfa e outros solos altamente orgânicos"
-             ) #
+             return _RESULTADO_PT
 
-        # --- Determina se é Solo Grosso ou Fino ---
+        # --- Monta a chave da tabela de decisão (solo grosso ou fino) ---
         if pass_peneira_200 < 50: # Solo Grosso
-            percent_grosso = 100.0 - pass_peneira_200
             percent_areia_total = pass_peneira_4 - pass_peneira_200
             percent_pedregulho_total = 100.0 - pass_peneira_4
 
             # É Pedregulho (G) ou Areia (S)? Verifica qual fração predomina
             is_pedregulho = percent_pedregulho_total > percent_areia_total
-            prefixo_principal = "G" if is_pedregulho else "S"
 
-            # --- Sub-classificação do Solo Grosso ---
             # Caso 1: Poucos finos (< 5%)
             if pass_peneira_200 < 5:
                 if Cu is None or Cc is None:
                      raise ValueError("Cu e Cc são necessários para classificar solos grossos com menos de 5% de finos.")
-
-                # Verifica critérios de Bem Graduado (W)
-                bem_graduado = False
-                if is_pedregulho:
-                    if Cu >= 4 and 1 <= Cc <= 3: bem_graduado = True # Critério GW
-                else: # É Areia
-                     if Cu >= 6 and 1 <= Cc <= 3: bem_graduado = True # Critério SW
-
-                sufixo_secundario = "W" if bem_graduado else "P"
-                descricao = f"{'Pedregulho' if is_pedregulho else 'Areia'} {'bem graduado(a)' if bem_graduado else 'mal graduado(a)'}, {'com pouca ou nenhuma finos'}"
-                classificacao = prefixo_principal + sufixo_secundario
+                chave = (_POUCOS_FINOS, is_pedregulho, _bem_graduado(is_pedregulho, Cu, Cc), None)
 
             # Caso 2: Muitos finos (> 12%)
             elif pass_peneira_200 > 12:
@@ -77,23 +134,9 @@ def classificar_uscs(dados: ClassificacaoUSCSInput) -> ClassificacaoUSCSOutput:
                      raise ValueError("LL e IP são necessários para classificar solos grossos com mais de 12% de finos.")
                  if ll < 0 or ip < 0:
                      raise ValueError("LL e IP não podem ser negativos.")
-
-                 # Usa Carta de Plasticidade para classificar a fração fina
-                 acima_linha_A, tipo_fino = _classificar_finos_carta(ll, ip)
-
-                 if tipo_fino is None: # IP inválido ou LL muito baixo (NP ou na zona hachurada)
-                      # A USCS classifica como GM ou SM se cair na zona hachurada (IP<4 ou abaixo A)
-                      if ip < 4 or (0.73 * (ll - 20)) > ip :
-                          tipo_fino = "M"
-                      else:
-                          # Se está acima da linha A mas IP < 4? Ou na linha A com IP < 4?
-                          # Esta condição é rara ou impossível pela definição da linha A.
-                          raise ValueError("Valores de LL e IP inconsistentes para classificação dos finos (acima da Linha A mas IP < 4).")
-
-
-                 sufixo_secundario = tipo_fino # M ou C
-                 classificacao = prefixo_principal + sufixo_secundario
-                 descricao = f"{'Pedregulho' if is_pedregulho else 'Areia'} {'siltoso(a)' if tipo_fino == 'M' else 'argiloso(a)'}"
+                 # Usa Carta de Plasticidade para classificar a fração fina (M ou C)
+                 tipo_fino = _tipo_fino_carta(ll, ip)
+                 chave = (_MUITOS_FINOS, is_pedregulho, None, tipo_fino)
 
             # Caso 3: Finos entre 5% e 12% (Classificação Dupla)
             else:
@@ -101,24 +144,8 @@ def classificar_uscs(dados: ClassificacaoUSCSInput) -> ClassificacaoUSCSOutput:
                      raise ValueError("LL, IP, Cu e Cc são necessários para classificação dupla (5-12% de finos).")
                  if ll < 0 or ip < 0 or Cu < 0 or Cc < 0:
                       raise ValueError("LL, IP, Cu e Cc não podem ser negativos.")
-
-                 # Determina sufixo W ou P
-                 bem_graduado = False
-                 if is_pedregulho:
-                     if Cu >= 4 and 1 <= Cc <= 3: bem_graduado = True
-                 else:
-                     if Cu >= 6 and 1 <= Cc <= 3: bem_graduado = True
-                 sufixo_graduacao = "W" if bem_graduado else "P"
-
-                 # Determina sufixo M ou C
-                 acima_linha_A, tipo_fino = _classificar_finos_carta(ll, ip)
-                 if tipo_fino is None:
-                     if ip < 4 or (0.73 * (ll - 20)) > ip : tipo_fino = "M"
-                     else: raise ValueError("Valores de LL e IP inconsistentes para classificação dupla.")
-                 sufixo_plasticidade = tipo_fino
-
-                 classificacao = f"{prefixo_principal}{sufixo_graduacao}-{prefixo_principal}{sufixo_plasticidade}"
-                 descricao = f"{'Pedregulho' if is_pedregulho else 'Areia'} {'bem graduado(a)' if bem_graduado else 'mal graduado(a)'} {'com silte' if tipo_fino == 'M' else 'com argila'}"
+                 tipo_fino = _tipo_fino_carta(ll, ip)
+                 chave = (_DUPLA, is_pedregulho, _bem_graduado(is_pedregulho, Cu, Cc), tipo_fino)
 
         else: # Solo Fino (>= 50% passando #200)
              if ll is None or ip is None:
@@ -126,62 +153,27 @@ def classificar_uscs(dados: ClassificacaoUSCSInput) -> ClassificacaoUSCSOutput:
              if ll < 0 or ip < 0:
                   raise ValueError("LL e IP não podem ser negativos.")
 
-             # Determina sufixo L ou H
-             sufixo_plasticidade = "L" if ll < 50 else "H"
-
-             # Verifica se é Orgânico (OL/OH) ou Inorgânico (ML/CL/MH/CH)
-             if is_organico_fino:
-                 prefixo_final = "O"
-                 descricao_tipo = "Solo Orgânico"
-             else:
-                 acima_linha_A, tipo_principal = _classificar_finos_carta(ll, ip)
-                 if tipo_principal is None:
-                      # Se caiu na zona hachurada (IP<4 ou abaixo A com IP<7) -> ML ou OL
-                      if ip < 4 or (0.73 * (ll - 20)) > ip :
-                          prefixo_final = "M" # Assume ML/MH
-                          descricao_tipo = "Silte"
-                      else:
-                          raise ValueError("Valores de LL e IP inconsistentes para classificação de solo fino.")
-                 else:
-                      prefixo_final = tipo_principal # M ou C
-                      descricao_tipo = "Silte" if prefixo_final == 'M' else "Argila"
-
-
-             classificacao = f"{prefixo_final}{sufixo_plasticidade}"
-             descricao_plast = "baixa plasticidade/compressibilidade" if sufixo_plasticidade == 'L' else "alta plasticidade/compressibilidade"
-             descricao = f"{descricao_tipo} de {descricao_plast}"
+             # Orgânico (OL/OH) ou Inorgânico (ML/CL/MH/CH); sufixo L ou H pelo LL
+             prefixo = "O" if is_organico_fino else _tipo_fino_carta(ll, ip)
+             chave = (_FINO, prefixo, "L" if ll < 50 else "H")
 
-
-        return ClassificacaoUSCSOutput(classificacao=classificacao, descricao=descricao)
+        return _RESULTADOS_USCS[chave]
 
     except ValueError as ve:
-        return ClassificacaoUSCSOutput(erro=str(ve))
+        return ClassificacaoUSCSOutput.model_construct(erro=str(ve))
     except Exception as e:
-        print(f"Erro inesperado na classificação USCS: {e}")
-        return ClassificacaoUSCSOutput(erro=f"Erro interno no servidor: {type(e).__name__}")
+        logger.exception("Erro inesperado na classificação USCS: %s", e)
+        return ClassificacaoUSCSOutput.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
 
 
-def _classificar_finos_carta(ll: float, ip: float) -> Tuple[Optional[bool], Optional[str]]:
+def _tipo_fino_carta(ll: float, ip: float) -> Literal["M", "C"]:
     """
-    Classifica a fração fina (M ou C) usando a Carta de Plasticidade de Casagrande.
-    Retorna uma tupla ``(acima_linha_A, tipo_fino)`` em que ``acima_linha_A`` indica se o ponto
-    está acima da linha A (``False`` significa que o ponto está abaixo da linha A) e
-    ``tipo_fino`` é "M" para siltes ou solos enquadrados abaixo da linha A/IP<4 e "C" para
-    argilas.
-    Retorna ``(None, None)`` apenas quando os dados de entrada são inválidos (valores
-    negativos).
+    Classifica a fração fina usando a Carta de Plasticidade de Casagrande: "M" (silte) abaixo
+    da linha A (IP = 0.73 * (LL - 20)) ou com IP < 4, "C" (argila) na linha A ou acima.
+    LL e IP já foram validados como não-negativos pelo chamador.
+    Sem cache de propósito: a regra custa uma comparação, e quantizar LL/IP para a chave
+    deslocaria pontos próximos da linha A. Entradas repetidas já são servidas inteiras por
+    `app.cache.calcular_com_cache`.
     """
-    if ll < 0 or ip < 0: return None, None # Valores não podem ser negativos
-
-    # Linha A
-    ip_linha_A = 0.73 * (ll - 20)
-
-    # Verifica zona hachurada (IP < 4 OU IP < IP_linha_A)
-    # A zona CL-ML (4 <= IP <= 7 e abaixo da linha A) é tratada separadamente pela classificação dupla em solos grossos,
-    # mas para solos finos, cai abaixo da linha A e é classificada como silte (M) nesta função.
-    if ip < 4 or ip < ip_linha_A:
-        return False, "M"  # Silte (M) quando abaixo da linha A ou IP < 4
-
-    # Se chegou aqui, está acima ou na linha A e IP >= 4
-    # Se está na linha A (IP == IP_linha_A) ou acima, classifica como Argila (C)
-    return True, "C"
+    # A zona CL-ML (4 <= IP <= 7 e abaixo da linha A) cai aqui como silte (M)
+    return "M" if ip < 4.0 or ip < 0.73 * (ll - 20.0) else "C"
@@ -1,10 +1,54 @@
+import math
 import numpy as np
+from operator import attrgetter
 from typing import List, Tuple, Optional
-from app.models import CompactacaoInput, CompactacaoOutput, PontoEnsaioCompactacao, PontoCurva
+from app.models import CompactacaoInput, CompactacaoOutput, PontoEnsaioCompactacao, PontoCurvaCompactacao
+from app.log import logger
+from app.modules._kernels import maximo_polinomio_cubico
+
+EPSILON = 1e-9
+# Número de pontos gerados para plotar a curva de saturação S=100%
+PONTOS_CURVA_SATURACAO = 20
+# Campos de PontoEnsaioCompactacao, na ordem de declaração: colunas do array (N, 6) dos pontos
+_CAMPOS_PONTO = attrgetter(
+    'massa_umida_total', 'massa_molde', 'volume_molde',
+    'massa_umida_recipiente_w', 'massa_seca_recipiente_w', 'massa_recipiente_w'
+)
+
+def _pontos_curva(pontos: np.ndarray) -> List[PontoCurvaCompactacao]:
+    """ Converte um array (N, 2) de pontos (w, γd) em PontoCurvaCompactacao. """
+    return [PontoCurvaCompactacao(w, gd) for w, gd in pontos.tolist()]
 
 # Precisaremos do numpy para a interpolação polinomial
 # Certifique-se que numpy está em requirements.txt e instalado
 
+def _ajustar_polinomio(x: np.ndarray, y: np.ndarray, grau: int) -> np.ndarray:
+    """
+    Mínimos quadrados do polinômio de grau `grau` (coeficientes do maior para o menor grau),
+    direto sobre a matriz de Vandermonde. As colunas são normalizadas antes do lstsq, como
+    no np.polyfit, para manter o sistema bem condicionado.
+    """
+    vander = np.vander(x, grau + 1)
+    escala = np.sqrt((vander * vander).sum(axis=0))
+    coeffs = np.linalg.lstsq(vander / escala, y, rcond=None)[0]
+    return coeffs / escala
+
+def _validar_ponto(i: int, ponto: PontoEnsaioCompactacao) -> None:
+    """ Validações básicas de um ponto do ensaio (levanta ValueError). """
+    if ponto.volume_molde <= 0:
+        raise ValueError(f"Volume do molde inválido ({ponto.volume_molde}) no ponto {i+1}.")
+    if ponto.massa_molde < 0:
+         raise ValueError(f"Massa do molde inválida ({ponto.massa_molde}) no ponto {i+1}.")
+    if ponto.massa_umida_total < ponto.massa_molde:
+         raise ValueError(f"Massa úmida total ({ponto.massa_umida_total}) menor que a massa do molde ({ponto.massa_molde}) no ponto {i+1}.")
+
+    massa_agua_w = ponto.massa_umida_recipiente_w - ponto.massa_seca_recipiente_w
+    massa_seca_w = ponto.massa_seca_recipiente_w - ponto.massa_recipiente_w
+    if massa_seca_w <= 0:
+        raise ValueError(f"Massa seca inválida ({massa_seca_w}) no cálculo de umidade do ponto {i+1}.")
+    if massa_agua_w < 0:
+         raise ValueError(f"Massa de água negativa ({massa_agua_w}) no cálculo de umidade do ponto {i+1}.")
+
 def calcular_compactacao(dados: CompactacaoInput) -> CompactacaoOutput:
     """
     Analisa os dados do ensaio de compactação de Proctor.
@@ -16,100 +60,63 @@ def calcular_compactacao(dados: CompactacaoInput) -> CompactacaoOutput:
     Retorna os resultados e pontos para plotagem dos gráficos.
     """
     try:
-        pontos_calculados: List[PontoCurva] = []
         gama_w = dados.peso_especifico_agua # kN/m³
-        # γw em g/cm³ para consistência com massas em g e volume em cm³
-        gama_w_gcm3 = gama_w / 9.81 if np.isclose(gama_w, 9.81, rtol=1e-2) else gama_w / 10.0
+        # Fator g/cm³ -> kN/m³: γw/γw(g/cm³), que só pode valer 9,81 (γw ≈ 9,81 kN/m³) ou 10,0
+        fator_gcm3_knm3 = 9.81 if abs(gama_w - 9.81) <= 1e-2 * 9.81 else 10.0
 
         if dados.Gs is not None and dados.Gs <= 0:
             raise ValueError("Gs (Densidade relativa dos grãos) deve ser maior que zero.")
         if gama_w <= 0:
              raise ValueError("Peso específico da água deve ser maior que zero.")
 
+        # Valida ponto a ponto: o erro indica o primeiro ponto inválido
         for i, ponto in enumerate(dados.pontos_ensaio):
-            # Validações básicas
-            if ponto.volume_molde <= 0:
-                raise ValueError(f"Volume do molde inválido ({ponto.volume_molde}) no ponto {i+1}.")
-            if ponto.massa_molde < 0:
-                 raise ValueError(f"Massa do molde inválida ({ponto.massa_molde}) no ponto {i+1}.")
-            if ponto.massa_umida_total < ponto.massa_molde:
-                 raise ValueError(f"Massa úmida total ({ponto.massa_umida_total}) menor que a massa do molde ({ponto.massa_molde}) no ponto {i+1}.")
-
-            # Cálculo da Umidade (w) para o ponto
-            massa_agua_w = ponto.massa_umida_recipiente_w - ponto.massa_seca_recipiente_w
-            massa_seca_w = ponto.massa_seca_recipiente_w - ponto.massa_recipiente_w
-            if massa_seca_w <= 0:
-                raise ValueError(f"Massa seca inválida ({massa_seca_w}) no cálculo de umidade do ponto {i+1}.")
-            if massa_agua_w < 0:
-                 raise ValueError(f"Massa de água negativa ({massa_agua_w}) no cálculo de umidade do ponto {i+1}.")
-
-            umidade_decimal = massa_agua_w / massa_seca_w # w em decimal
-            umidade_percentual = umidade_decimal * 100
-
-            # Cálculo do Peso Específico Seco (γd) para o ponto
-            massa_solo_umido = ponto.massa_umida_total - ponto.massa_molde
-            # Assume entrada em g e cm³, calcula γh em g/cm³
-            gama_h_gcm3 = massa_solo_umido / ponto.volume_molde
-            # Converte γh para kN/m³
-            gama_h_knm3 = gama_h_gcm3 * gama_w / gama_w_gcm3 # Regra de três: (g/cm³) * (kN/m³ / (g/cm³))
-
-            gama_d = gama_h_knm3 / (1 + umidade_decimal) # γd = γh / (1 + w)
-
-            pontos_calculados.append(PontoCurva(umidade=umidade_percentual, peso_especifico_seco=gama_d))
+            _validar_ponto(i, ponto)
+
+        # Todos os pontos (já validados) de uma vez, num array (N, 6) com os campos de cada ponto
+        pontos_arr = np.array(list(map(_CAMPOS_PONTO, dados.pontos_ensaio)), dtype=np.float64).reshape(-1, 6)
+        (massa_umida_total, massa_molde, volume_molde,
+         massa_umida_rec_w, massa_seca_rec_w, massa_recipiente_w) = pontos_arr.T
+        massas_agua_w = massa_umida_rec_w - massa_seca_rec_w
+        massas_seca_w = massa_seca_rec_w - massa_recipiente_w
+
+        # Umidade (w) de cada ponto
+        umidades_decimal = massas_agua_w / massas_seca_w # w em decimal
+
+        # Peso Específico Seco (γd) de cada ponto
+        # Assume entrada em g e cm³, calcula γh em g/cm³
+        gamas_h_gcm3 = (massa_umida_total - massa_molde) / volume_molde
+        # Converte γh para kN/m³
+        gamas_h_knm3 = gamas_h_gcm3 * fator_gcm3_knm3
+
+        # Pontos (w%, γd) num único array (N, 2); convertidos em PontoCurvaCompactacao só na saída
+        pontos_calculados = np.column_stack((umidades_decimal * 100, gamas_h_knm3 / (1 + umidades_decimal))) # γd = γh / (1 + w)
 
         if len(pontos_calculados) < 3:
-            return CompactacaoOutput(pontos_curva_compactacao=pontos_calculados, erro="São necessários pelo menos 3 pontos para traçar a curva de compactação.")
+            return CompactacaoOutput.model_construct(pontos_curva_compactacao=_pontos_curva(pontos_calculados), erro="São necessários pelo menos 3 pontos para traçar a curva de compactação.")
 
         # Ordena os pontos pela umidade para a interpolação
-        pontos_calculados.sort(key=lambda p: p.umidade)
-
-        umidades = np.array([p.umidade for p in pontos_calculados])
-        gamas_d = np.array([p.peso_especifico_seco for p in pontos_calculados])
+        pontos_calculados = pontos_calculados[np.argsort(pontos_calculados[:, 0], kind='stable')]
+        umidades, gamas_d = pontos_calculados.T
 
         # Ajuste polinomial (grau 2 ou 3 é geralmente suficiente)
         # Grau 3 pode capturar melhor a assimetria, mas pode oscilar com poucos pontos
         grau_polinomio = 3 if len(pontos_calculados) >= 4 else 2
         try:
-             coeffs = np.polyfit(umidades, gamas_d, grau_polinomio)
-             poly = np.poly1d(coeffs)
-
-             # Encontra o máximo da curva polinomial
-             # Derivada do polinômio
-             deriv = poly.deriv()
-             # Raízes da derivada (pontos críticos)
-             critical_points = deriv.roots
-             # Filtra raízes reais dentro do intervalo de umidade do ensaio
-             real_roots = critical_points[np.isreal(critical_points)].real
-             valid_roots = real_roots[(real_roots >= umidades.min()) & (real_roots <= umidades.max())]
-
-             if len(valid_roots) > 0:
-                 # Calcula a segunda derivada para verificar se é máximo
-                 second_deriv = deriv.deriv()
-                 # Avalia a segunda derivada nos pontos críticos válidos
-                 second_deriv_values = second_deriv(valid_roots)
-                 # Encontra o índice onde a segunda derivada é negativa (ponto de máximo)
-                 max_indices = np.where(second_deriv_values < 0)[0]
-
-                 if len(max_indices) > 0:
-                     # Pega a umidade correspondente ao primeiro máximo encontrado
-                     w_ot = valid_roots[max_indices[0]]
-                     gd_max = poly(w_ot)
-                 else: # Se não houver máximo claro (talvez pontos mal distribuídos)
-                      # Pega o ponto mais alto dos dados originais como aproximação
-                      max_idx = np.argmax(gamas_d)
-                      w_ot = umidades[max_idx]
-                      gd_max = gamas_d[max_idx]
-             else: # Se nenhuma raiz estiver no intervalo, pega o máximo dos pontos originais
-                 max_idx = np.argmax(gamas_d)
-                 w_ot = umidades[max_idx]
-                 gd_max = gamas_d[max_idx]
-
+             coeffs = _ajustar_polinomio(umidades, gamas_d, grau_polinomio)
+             # Máximo da curva em forma fechada (ponto crítico com 2ª derivada negativa no intervalo)
+             a, b, c, d = coeffs.tolist() if grau_polinomio == 3 else [0.0, *coeffs.tolist()]
+             w_ot, gd_max = maximo_polinomio_cubico(a, b, c, d, float(umidades.min()), float(umidades.max()))
         except (np.linalg.LinAlgError, ValueError):
-            # Se o ajuste falhar, retorna erro ou usa o ponto máximo medido
-             max_idx = np.argmax(gamas_d)
-             w_ot = umidades[max_idx]
-             gd_max = gamas_d[max_idx]
-             # Poderia adicionar uma mensagem de aviso aqui
+            # Se o ajuste falhar, usa o ponto máximo medido
+            w_ot = gd_max = math.nan
+
+        if math.isnan(w_ot):
+            # Sem máximo claro no intervalo (ex: pontos mal distribuídos ou ajuste falhou):
+            # pega o ponto mais alto dos dados originais como aproximação
+            max_idx = np.argmax(gamas_d)
+            w_ot = umidades[max_idx]
+            gd_max = gamas_d[max_idx]
 
         # --- Cálculo da Curva de Saturação S=100% ---
         pontos_saturacao_100 = []
@@ -118,26 +125,23 @@ def calcular_compactacao(dados: CompactacaoInput) -> CompactacaoOutput:
             # Começa um pouco antes da menor umidade medida e vai até um pouco depois da maior
             w_min_plot = max(0, umidades.min() - 5)
             w_max_plot = umidades.max() + 10
-            umidades_plot = np.linspace(w_min_plot, w_max_plot, 20) # 20 pontos para a curva
-
-            for w_p in umidades_plot:
-                w_dec = w_p / 100.0
-                # Fórmula da curva de S=100%: γd = Gs * γw / (1 + Gs * w)
-                denominador = (1 + dados.Gs * w_dec)
-                if abs(denominador) > EPSILON:
-                     gd_sat = (dados.Gs * gama_w) / denominador
-                     pontos_saturacao_100.append(PontoCurva(umidade=w_p, peso_especifico_seco=gd_sat))
-
-        return CompactacaoOutput(
-            umidade_otima=round(w_ot, 2),
-            peso_especifico_seco_max=round(gd_max, 3), # Mais precisão para γd
-            pontos_curva_compactacao=pontos_calculados,
+            umidades_plot = np.linspace(w_min_plot, w_max_plot, PONTOS_CURVA_SATURACAO)
+
+            # Fórmula da curva de S=100%: γd = Gs * γw / (1 + Gs * w), calculada de uma vez.
+            # Com w >= 0 e Gs > 0 o denominador é sempre >= 1 (sem divisão por zero)
+            curva_saturacao = np.column_stack((umidades_plot, (dados.Gs * gama_w) / (1.0 + dados.Gs * (umidades_plot / 100.0))))
+            pontos_saturacao_100 = _pontos_curva(curva_saturacao)
+
+        # Resultado montado internamente (floats e pontos já prontos): model_construct dispensa a validação
+        return CompactacaoOutput.model_construct(
+            umidade_otima=round(float(w_ot), 2),
+            peso_especifico_seco_max=round(float(gd_max), 3), # Mais precisão para γd
+            pontos_curva_compactacao=_pontos_curva(pontos_calculados),
             pontos_curva_saturacao_100=pontos_saturacao_100 if pontos_saturacao_100 else None
         )
 
     except ValueError as ve:
-         return CompactacaoOutput(erro=str(ve))
+         return CompactacaoOutput.model_construct(erro=str(ve))
     except Exception as e:
-        print(f"Erro inesperado no cálculo de compactação: {e}")
-        # Logar o traceback completo seria útil
-        return CompactacaoOutput(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("Erro inesperado no cálculo de compactação: %s", e)
+        return CompactacaoOutput.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
@@ -1,12 +1,19 @@
 # backend/app/modules/fluxo_hidraulico.py
 import numpy as np
-from typing import List, Optional, Dict
+from operator import attrgetter
+from typing import Dict, Iterator, List, Optional
 # Importa os modelos Pydantic definidos em app/models.py
 from app.models import CamadaFluxo, FluxoHidraulicoOutput, TensaoPontoFluxo
+from app.modules._arredondamento import arredondar_casas
+from app.modules._kernels import NUMBA_DISPONIVEL, tensoes_fluxo_perfil
 
 PI = np.pi
 EPSILON = 1e-9
 
+# Extração dos campos das camadas como tuplas (em C), para montar os arrays
+_ESPESSURA_K = attrgetter('espessura', 'k')
+_ESPESSURA_GAMMA_SAT = attrgetter('espessura', 'gamma_sat')
+
 def calcular_permeabilidade_equivalente(camadas: List[CamadaFluxo], direcao: str) -> Optional[float]:
     """
     Calcula o coeficiente de permeabilidade equivalente para fluxo
@@ -18,35 +25,41 @@ def calcular_permeabilidade_equivalente(camadas: List[CamadaFluxo], direcao: str
     if not camadas:
         return None
 
-    espessura_total = sum(c.espessura for c in camadas if c.espessura is not None and c.espessura > 0)
+    # Verifica se todas as camadas têm k definido
+    if any(c.k is None for c in camadas):
+        raise ValueError("Todas as camadas devem ter um coeficiente de permeabilidade (k) não-negativo definido.")
+
+    # Espessuras e permeabilidades extraídas uma única vez
+    espessuras, ks = np.array(list(map(_ESPESSURA_K, camadas)), dtype=np.float64).T
+
+    espessura_total = espessuras[espessuras > 0].sum()
     if espessura_total <= EPSILON:
         return None
 
-    # Verifica se todas as camadas têm k definido
-    if any(c.k is None or c.k < 0 for c in camadas):
+    if (ks < 0).any():
         raise ValueError("Todas as camadas devem ter um coeficiente de permeabilidade (k) não-negativo definido.")
 
     if direcao.lower() == 'horizontal':
         # Média ponderada pela espessura
-        kh_num = sum(c.k * c.espessura for c in camadas)
-        return kh_num / espessura_total
+        return float(np.dot(ks, espessuras) / espessura_total)
     elif direcao.lower() == 'vertical':
         # Média harmônica ponderada pela espessura
-        # Verifica se algum k é zero para evitar divisão por zero
-        if any(np.isclose(c.k, 0) for c in camadas):
+        com_espessura = espessuras > EPSILON
+        k_nulo = np.isclose(ks, 0)
+        if k_nulo.any():
              # Se alguma camada for impermeável (k=0), kv será zero
              # (assumindo que a espessura dessa camada não é zero)
-             if any(np.isclose(c.k, 0) and c.espessura > EPSILON for c in camadas):
+             if (k_nulo & com_espessura).any():
                  return 0.0
-             else: # Se k=0 mas espessura=0, ignora essa camada
-                  kv_den_sum = sum(c.espessura / c.k for c in camadas if c.k is not None and c.k > EPSILON and c.espessura > EPSILON)
-                  if kv_den_sum <= EPSILON: return None # Caso incomum
-                  return espessura_total / kv_den_sum
+             # Se k=0 mas espessura=0, ignora essa camada
+             validas = (ks > EPSILON) & com_espessura
+        else:
+             validas = ks > EPSILON # Evita k=0
 
-        kv_den_sum = sum(c.espessura / c.k for c in camadas if c.k > EPSILON) # Evita k=0
+        kv_den_sum = np.dot(espessuras[validas], 1.0 / ks[validas])
         if kv_den_sum <= EPSILON:
             return None # Evita divisão por zero se todos os k/espessura forem zero
-        return espessura_total / kv_den_sum
+        return float(espessura_total / kv_den_sum)
     else:
         raise ValueError("Direção deve ser 'horizontal' ou 'vertical'.")
 
@@ -78,10 +91,29 @@ def calcular_tensoes_com_fluxo(
     gamma_w: float,
     direcao_fluxo: str # 'ascendente' ou 'descendente' (vertical)
 ) -> List[TensaoPontoFluxo]:
+    """
+    Calcula as tensões (total, neutra, efetiva) em várias profundidades
+    sob fluxo vertical constante. Versão em lista de `iter_tensoes_com_fluxo`.
+    """
+    return list(iter_tensoes_com_fluxo(
+        profundidades, camadas, profundidade_na_entrada, profundidade_na_saida, gamma_w, direcao_fluxo
+    ))
+
+def iter_tensoes_com_fluxo(
+    profundidades: List[float],
+    camadas: List[CamadaFluxo],
+    profundidade_na_entrada: float,
+    profundidade_na_saida: float,
+    gamma_w: float,
+    direcao_fluxo: str
+) -> Iterator[TensaoPontoFluxo]:
     """
     Calcula as tensões (total, neutra, efetiva) em várias profundidades
     sob fluxo vertical constante. Assume solo totalmente saturado entre a entrada e saída.
 
+    Os dados são validados imediatamente (ValueError é levantado na chamada); os pontos
+    são produzidos um a um, em ordem crescente de profundidade, à medida que são calculados.
+
     Args:
         profundidades: Lista de profundidades (z) desde a superfície.
         camadas: Lista das camadas saturadas envolvidas no fluxo.
@@ -91,7 +123,7 @@ def calcular_tensoes_com_fluxo(
         direcao_fluxo: 'ascendente' ou 'descendente'.
 
     Returns:
-        Lista de TensaoPontoFluxo com os resultados.
+        Iterador de TensaoPontoFluxo com os resultados.
 
     Referências:
     - PDF: 10.2. Hidrulica_dos_Solos_Ana_Patricia_Maio_2022_Parte_2.pdf (Págs. 4-6)
@@ -122,10 +154,56 @@ def calcular_tensoes_com_fluxo(
     if direcao_fluxo.lower() == 'ascendente' and i_medio > 0:
          raise ValueError("Direção de fluxo 'ascendente' inconsistente com NA de entrada acima do NA de saída.")
 
-    resultados: List[TensaoPontoFluxo] = []
-    tensao_total_acumulada = 0.0 # Tensão total na profundidade_topo_fluxo (pode vir de camadas acima)
-    profundidade_camada_atual = profundidade_topo_fluxo
-
+    return _gerar_tensoes_com_fluxo(profundidades, camadas, profundidade_na_entrada, profundidade_topo_fluxo, i_medio, gamma_w)
+
+def _perfil_fluxo_numpy(
+    espessuras: np.ndarray,
+    gamas_sat: np.ndarray,
+    z_pontos: np.ndarray,
+    profundidade_topo_fluxo: float,
+    carga_total_topo: float,
+    i_medio: float,
+    gamma_w: float
+):
+    """ Versão vetorizada de `tensoes_fluxo_perfil`, usada quando o Numba não está disponível. """
+    # Topos das camadas e tensão total acumulada no topo de cada camada
+    topos = profundidade_topo_fluxo + np.concatenate(([0.0], np.cumsum(espessuras)))
+    tensao_total_topos = np.concatenate(([0.0], np.cumsum(gamas_sat * espessuras)))
+
+    # Camada de cada ponto (busca binária); pontos numa interface ficam na camada de cima.
+    # Ponto abaixo da última camada de fluxo: calculado na base da última camada
+    idx_camada = np.minimum(np.searchsorted(topos[1:] + EPSILON, z_pontos, side='left'), len(espessuras) - 1)
+    z_relativo = np.minimum(z_pontos - topos[idx_camada], espessuras[idx_camada])
+
+    # Tensão Total Vertical (σv)
+    sigma_v = tensao_total_topos[idx_camada] + gamas_sat[idx_camada] * z_relativo
+
+    # Carga Hidráulica Total (h_total) em cada ponto, com o gradiente médio
+    carga_total_pontos = carga_total_topo + i_medio * (z_pontos - profundidade_topo_fluxo)
+
+    # Pressão Neutra (u): h_total = u/gamma_w + Z_elev => u = gamma_w * (h_total - Z_elev),
+    # com Z_elev = -z (datum na superfície). Não pode ser negativa em fluxo saturado
+    # (exceto capilaridade, não considerada aqui)
+    pressao_neutra = np.maximum(0.0, gamma_w * (carga_total_pontos + z_pontos))
+
+    # Tensão Efetiva Vertical (σ'v), não-negativa
+    tensao_efetiva_v = np.maximum(0.0, sigma_v - pressao_neutra)
+
+    return sigma_v, pressao_neutra, tensao_efetiva_v, carga_total_pontos
+
+
+def _gerar_tensoes_com_fluxo(
+    profundidades: List[float],
+    camadas: List[CamadaFluxo],
+    profundidade_na_entrada: float,
+    profundidade_topo_fluxo: float,
+    i_medio: float,
+    gamma_w: float
+) -> Iterator[TensaoPontoFluxo]:
+    """
+    Gerador dos pontos de tensão; os dados já foram validados por `iter_tensoes_com_fluxo`.
+    O perfil é calculado de uma vez com NumPy e os pontos são produzidos em seguida.
+    """
     # Calcula a carga hidráulica no topo da zona de fluxo
     # h_total(z) = u/gamma_w + z_elevation (datum na superfície, z positivo para baixo)
     # h_total_topo = profundidade_na_entrada (se z=0 for superfície) - profundidade_topo_fluxo ???
@@ -135,51 +213,33 @@ def calcular_tensoes_com_fluxo(
     # Carga total no NA saida = 0 + (-profundidade_na_saida) = -profundidade_na_saida
     carga_total_topo = -profundidade_na_entrada # Assumindo que a entrada define a carga no topo da zona
 
-    pontos_interesse = sorted(list(set(profundidades))) # Ordena e remove duplicados
-
-    idx_camada = 0
-    for z_ponto in pontos_interesse:
-        # Encontra a camada onde o ponto está
-        while idx_camada < len(camadas) and z_ponto > profundidade_camada_atual + camadas[idx_camada].espessura + EPSILON:
-             tensao_total_acumulada += camadas[idx_camada].gamma_sat * camadas[idx_camada].espessura
-             profundidade_camada_atual += camadas[idx_camada].espessura
-             idx_camada += 1
-
-        if idx_camada >= len(camadas): # Ponto está abaixo da última camada de fluxo
-            # Calcular como se estivesse na base da última camada? Ou erro?
-            # Por simplicidade, calcula na base da última camada
-            z_relativo = camadas[-1].espessura
-            camada_atual = camadas[-1]
-        else:
-            z_relativo = z_ponto - profundidade_camada_atual
-            camada_atual = camadas[idx_camada]
-
-        # Calcula Tensão Total Vertical (σv)
-        sigma_v = tensao_total_acumulada + camada_atual.gamma_sat * z_relativo
-
-        # Calcula Carga Hidráulica Total (h_total) no ponto z_ponto
-        # Assumindo gradiente constante dentro de cada camada ou médio? Usar médio por simplicidade.
-        carga_total_ponto = carga_total_topo + i_medio * (z_ponto - profundidade_topo_fluxo)
+    # Profundidades ordenadas e sem duplicados
+    z_pontos = np.unique(np.asarray(profundidades, dtype=np.float64))
 
-        # Calcula Pressão Neutra (u)
-        # h_total = u/gamma_w + Z_elev => u = gamma_w * (h_total - Z_elev)
-        # Z_elev = -z_ponto (datum na superfície)
-        pressao_neutra = gamma_w * (carga_total_ponto - (-z_ponto))
-        pressao_neutra = max(0, pressao_neutra) # Pressão neutra não pode ser negativa em fluxo saturado (exceto capilaridade, não considerada aqui)
+    # Camadas como arrays
+    espessuras, gamas_sat = np.array(list(map(_ESPESSURA_GAMMA_SAT, camadas)), dtype=np.float64).T
 
-        # Calcula Tensão Efetiva Vertical (σ'v)
-        tensao_efetiva_v = sigma_v - pressao_neutra
-        tensao_efetiva_v = max(0, tensao_efetiva_v) # Garante não-negatividade
-
-        resultados.append(TensaoPontoFluxo(
-            profundidade=z_ponto,
-            tensao_total_vertical=round(sigma_v, 3),
-            pressao_neutra=round(pressao_neutra, 3),
-            tensao_efetiva_vertical=round(tensao_efetiva_v, 3),
-            carga_hidraulica_total=round(carga_total_ponto, 3)
-        ))
-
-    return resultados
+    if NUMBA_DISPONIVEL:
+        # Núcleo compilado: percorre pontos e camadas num único laço
+        # (escreve direto nas linhas do array 4 x N de resultados, sem cópia posterior)
+        resultados = np.empty((4, z_pontos.size))
+        tensoes_fluxo_perfil(espessuras, gamas_sat, z_pontos, profundidade_topo_fluxo, carga_total_topo,
+                             i_medio, gamma_w, *resultados)
+    else:
+        resultados = np.stack(_perfil_fluxo_numpy(
+            espessuras, gamas_sat, z_pontos, profundidade_topo_fluxo, carga_total_topo, i_medio, gamma_w))
+
+    # Arredondamento a 3 casas (como round()) feito de uma vez, no próprio buffer, sobre as quatro
+    # grandezas (σv, u, σ'v, h) do array 4 x N
+    arredondar_casas(resultados, 3)
+    for z, sv, u, sev, h in zip(z_pontos.tolist(), *resultados.tolist()):
+        yield TensaoPontoFluxo(
+            profundidade=z,
+            tensao_total_vertical=sv,
+            pressao_neutra=u,
+            tensao_efetiva_vertical=sev,
+            carga_hidraulica_total=h
+        )
 
 
 def calcular_gradiente_critico(gamma_sat: float, gamma_w: float) -> Optional[float]:
@@ -208,4 +268,30 @@ def calcular_fs_liquefacao(icrit: float, i_atuante: float) -> Optional[float]:
     if icrit < 0: # icrit inválido
         return None
     fs = icrit / i_atuante #
-    return fs
\ No newline at end of file
+    return fs
+
+def calcular_gradiente_critico_batch(gamma_sat: np.ndarray, gamma_w: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `calcular_gradiente_critico` (ex: γsat de cada camada de um perfil).
+    Aceita escalares ou arrays (com broadcast); os casos em que a versão escalar retorna None
+    (γw ~ 0 ou γsat < γw) resultam em NaN.
+    """
+    gamma_sat = np.asarray(gamma_sat, dtype=np.float64)
+    gamma_w = np.asarray(gamma_w, dtype=np.float64)
+    gamma_sub = gamma_sat - gamma_w
+    with np.errstate(divide='ignore', invalid='ignore'):
+        icrit = gamma_sub / gamma_w
+    return np.where((gamma_w <= EPSILON) | (gamma_sub < 0), np.nan, icrit)
+
+def calcular_fs_liquefacao_batch(icrit: np.ndarray, i_atuante: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `calcular_fs_liquefacao` (ex: FS ao longo da profundidade).
+    Sem fluxo ascendente significativo (i_atuante ~ 0) o FS é infinito; icrit inválido
+    (negativo ou NaN) resulta em NaN.
+    """
+    icrit = np.asarray(icrit, dtype=np.float64)
+    i_atuante = np.asarray(i_atuante, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fs = icrit / i_atuante
+    fs = np.where(icrit < 0, np.nan, fs)
+    return np.where(i_atuante <= EPSILON, np.inf, fs)
@@ -1,17 +1,47 @@
 # backend/app/modules/limites_consistencia.py
 
+import math
 import numpy as np
+from operator import attrgetter
 from typing import List, Optional
 # Importa os modelos Pydantic do ficheiro centralizado
 from app.models import (
     PontoEnsaioLL,
     LimitesConsistenciaInput,
     LimitesConsistenciaOutput,
-    PontoCurva
+    PontoCurva,
+    ClassePlasticidade,
+    ClasseConsistencia,
+    ClasseAtividade
 )
-
-# Constante para logaritmo
-LOG10_25 = np.log10(25)
+from app.log import logger
+
+# Constante para logaritmo (float do Python: os cálculos escalares não passam pelo NumPy)
+LOG10_25 = math.log10(25)
+# Campos de PontoEnsaioLL: colunas do array (N, 4) dos pontos do LL
+_CAMPOS_PONTO_LL = attrgetter('num_golpes', 'massa_umida_recipiente', 'massa_seca_recipiente', 'massa_recipiente')
+
+def _pontos_curva(pontos: np.ndarray) -> List[PontoCurva]:
+    """ Converte um array (N, 2) de pontos (x, y) em PontoCurva. """
+    return [PontoCurva(x, y) for x, y in pontos.tolist()]
+
+def _validar_ponto_ll(i: int, ponto: PontoEnsaioLL) -> None:
+    """ Validações básicas de um ponto do ensaio de LL (levanta ValueError). """
+    if ponto.massa_umida_recipiente < ponto.massa_seca_recipiente:
+         raise ValueError(f"Ponto LL {i+1}: Massa úmida ({ponto.massa_umida_recipiente}g) menor que massa seca ({ponto.massa_seca_recipiente}g).")
+    if ponto.massa_seca_recipiente < ponto.massa_recipiente:
+         raise ValueError(f"Ponto LL {i+1}: Massa seca ({ponto.massa_seca_recipiente}g) menor que massa do recipiente ({ponto.massa_recipiente}g).")
+    if ponto.num_golpes <= 0:
+         raise ValueError(f"Ponto LL {i+1}: Número de golpes ({ponto.num_golpes}) inválido.")
+
+    massa_agua = ponto.massa_umida_recipiente - ponto.massa_seca_recipiente
+    massa_seca = ponto.massa_seca_recipiente - ponto.massa_recipiente
+
+    if massa_seca <= 1e-9: # Evita divisão por zero
+        raise ValueError(f"Ponto LL {i+1}: Massa seca calculada é zero ou negativa ({massa_seca:.2f}g). Verifique os dados.")
+    if massa_agua < 0:
+        # Pode acontecer devido a erros de pesagem, tratar como 0? Ou erro? Lançar erro é mais seguro.
+         raise ValueError(f"Ponto LL {i+1}: Massa de água calculada é negativa ({massa_agua:.2f}g). Verifique os dados.")
 
 def calcular_limites_consistencia(dados: LimitesConsistenciaInput) -> LimitesConsistenciaOutput:
     """
@@ -23,47 +53,36 @@ def calcular_limites_consistencia(dados: LimitesConsistenciaInput) -> LimitesCon
     """
     try:
         # --- Cálculo das Umidades dos pontos do Ensaio LL ---
-        pontos_grafico_ll_log: List[PontoCurva] = []
-        umidades_ll: List[float] = []
-        log_golpes_ll: List[float] = []
-
         if len(dados.pontos_ll) < 2:
             raise ValueError("São necessários pelo menos 2 pontos para o cálculo do Limite de Liquidez.")
 
+        # Valida ponto a ponto: o erro indica o primeiro ponto inválido
         for i, ponto in enumerate(dados.pontos_ll):
-            # Validações básicas
-            if ponto.massa_umida_recipiente < ponto.massa_seca_recipiente:
-                 raise ValueError(f"Ponto LL {i+1}: Massa úmida ({ponto.massa_umida_recipiente}g) menor que massa seca ({ponto.massa_seca_recipiente}g).")
-            if ponto.massa_seca_recipiente < ponto.massa_recipiente:
-                 raise ValueError(f"Ponto LL {i+1}: Massa seca ({ponto.massa_seca_recipiente}g) menor que massa do recipiente ({ponto.massa_recipiente}g).")
-            if ponto.num_golpes <= 0:
-                 raise ValueError(f"Ponto LL {i+1}: Número de golpes ({ponto.num_golpes}) inválido.")
-
-            massa_agua = ponto.massa_umida_recipiente - ponto.massa_seca_recipiente
-            massa_seca = ponto.massa_seca_recipiente - ponto.massa_recipiente
-
-            if massa_seca <= 1e-9: # Evita divisão por zero
-                raise ValueError(f"Ponto LL {i+1}: Massa seca calculada é zero ou negativa ({massa_seca:.2f}g). Verifique os dados.")
-            if massa_agua < 0:
-                # Pode acontecer devido a erros de pesagem, tratar como 0? Ou erro? Lançar erro é mais seguro.
-                 raise ValueError(f"Ponto LL {i+1}: Massa de água calculada é negativa ({massa_agua:.2f}g). Verifique os dados.")
-
-            umidade_ponto = (massa_agua / massa_seca) * 100 # Em porcentagem [cite: 80]
-            log_golpes = np.log10(ponto.num_golpes)
-
-            pontos_grafico_ll_log.append(PontoCurva(x=log_golpes, y=umidade_ponto))
-            umidades_ll.append(umidade_ponto)
-            log_golpes_ll.append(log_golpes)
+            _validar_ponto_ll(i, ponto)
+
+        # Todos os pontos (já validados) de uma vez, num array (N, 4) com os campos de cada ponto
+        pontos_arr = np.array(list(map(_CAMPOS_PONTO_LL, dados.pontos_ll)), dtype=np.float64).reshape(-1, 4)
+        num_golpes, massa_umida, massa_seca_rec, massa_recipiente = pontos_arr.T
+        massas_agua = massa_umida - massa_seca_rec
+        massas_seca = massa_seca_rec - massa_recipiente
+
+        # Pontos (log10(N), w%) num único array (N, 2); convertidos em PontoCurva só na saída
+        curva_ll = np.column_stack((num_golpes, (massas_agua / massas_seca) * 100)) # Umidade em porcentagem [cite: 80]
+        np.log10(curva_ll[:, 0], out=curva_ll[:, 0])
+        log_golpes_ll, umidades_ll = curva_ll.T
 
         # --- Cálculo do Limite de Liquidez (LL) ---
-        # Regressão Linear: log10(N) vs w%
-        # Queremos w = a * log10(N) + b => polyfit retorna [a, b]
-        try:
-            coeffs = np.polyfit(log_golpes_ll, umidades_ll, 1) # Grau 1 para regressão linear
-            poly_func = np.poly1d(coeffs)
-            ll_calculado = poly_func(LOG10_25) # LL é a umidade para N=25 golpes
-        except (np.linalg.LinAlgError, ValueError) as e:
-             raise ValueError(f"Erro ao calcular regressão linear para LL: {e}. Verifique os pontos do ensaio.")
+        # Regressão Linear: log10(N) vs w%, w = a * log10(N) + b, em forma fechada
+        # (mínimos quadrados com variáveis centradas: a = Sxy / Sxx, reta passa pelas médias)
+        log_golpes_medio = log_golpes_ll.mean()
+        umidade_media = umidades_ll.mean()
+        desvios_log = log_golpes_ll - log_golpes_medio
+        sxx = desvios_log @ desvios_log
+        if sxx <= 1e-9: # Todos os pontos com o mesmo número de golpes: reta indefinida
+            raise ValueError("Erro ao calcular regressão linear para LL: os pontos precisam ter números de golpes diferentes. Verifique os pontos do ensaio.")
+        a = (desvios_log @ (umidades_ll - umidade_media)) / sxx
+        # LL é a umidade para N=25 golpes; daqui em diante só escalares, em float do Python
+        ll_calculado = float(umidade_media + a * (LOG10_25 - log_golpes_medio))
 
         if ll_calculado < 0: ll_calculado = 0.0 # Umidade não pode ser negativa
 
@@ -93,43 +112,43 @@ def calcular_limites_consistencia(dados: LimitesConsistenciaInput) -> LimitesCon
             is_np = True # Indica que é não plástico ou LL < LP
 
         # --- Classificação da Plasticidade --- [cite: 3054]
-        classificacao_plasticidade = None
-        if is_np or np.isclose(ip_calculado, 0):
-             classificacao_plasticidade = "Não Plástico (NP)"
+        classificacao_plasticidade: Optional[ClassePlasticidade] = None
+        if is_np or math.isclose(ip_calculado, 0.0, abs_tol=1e-8): # Mesma tolerância do np.isclose
+             classificacao_plasticidade = ClassePlasticidade.NAO_PLASTICO
         elif ip_calculado > 0 and ip_calculado <= 7:
-            classificacao_plasticidade = "Fracamente Plástico"
+            classificacao_plasticidade = ClassePlasticidade.FRACA
         elif ip_calculado > 7 and ip_calculado <= 15:
-            classificacao_plasticidade = "Medianamente Plástico"
+            classificacao_plasticidade = ClassePlasticidade.MEDIA
         elif ip_calculado > 15:
-            classificacao_plasticidade = "Altamente Plástico"
+            classificacao_plasticidade = ClassePlasticidade.ALTA
 
         # --- Cálculo do Índice de Consistência (IC) ---
         ic_calculado: Optional[float] = None
-        classificacao_consistencia: Optional[str] = None
+        classificacao_consistencia: Optional[ClasseConsistencia] = None
         if dados.umidade_natural is not None:
             if ip_calculado > 1e-9: # Evita divisão por zero se IP=0
                 ic_calculado = (ll_calculado - dados.umidade_natural) / ip_calculado #
 
                 # --- Classificação da Consistência ---
                 if ic_calculado < 0:
-                    classificacao_consistencia = "Muito Mole (líquida)" # w > LL
+                    classificacao_consistencia = ClasseConsistencia.MUITO_MOLE # w > LL
                 elif ic_calculado >= 0 and ic_calculado < 0.5:
-                    classificacao_consistencia = "Mole"
+                    classificacao_consistencia = ClasseConsistencia.MOLE
                 elif ic_calculado >= 0.5 and ic_calculado < 0.75:
-                    classificacao_consistencia = "Média"
+                    classificacao_consistencia = ClasseConsistencia.MEDIA
                 elif ic_calculado >= 0.75 and ic_calculado < 1.0:
-                    classificacao_consistencia = "Rija"
+                    classificacao_consistencia = ClasseConsistencia.RIJA
                 elif ic_calculado >= 1.0:
-                    classificacao_consistencia = "Dura (semi-sólida/sólida)" # w < LP
+                    classificacao_consistencia = ClasseConsistencia.DURA # w < LP
             else:
                  # Se IP=0 (NP), o conceito de IC não se aplica da mesma forma.
                  # Poderia indicar "Não aplicável (solo NP)"
-                 classificacao_consistencia = "Não aplicável (solo Não Plástico)"
+                 classificacao_consistencia = ClasseConsistencia.NAO_APLICAVEL
 
 
         # --- Cálculo da Atividade da Argila (Ia) ---
         atividade_calculada: Optional[float] = None
-        classificacao_atividade: Optional[str] = None
+        classificacao_atividade: Optional[ClasseAtividade] = None
         if dados.percentual_argila is not None:
             if dados.percentual_argila < 0 or dados.percentual_argila > 100:
                  raise ValueError("Percentual de argila deve estar entre 0 e 100%.")
@@ -139,23 +158,23 @@ def calcular_limites_consistencia(dados: LimitesConsistenciaInput) -> LimitesCon
 
                  # --- Classificação da Atividade ---
                  if atividade_calculada < 0.75:
-                     classificacao_atividade = "Inativa"
+                     classificacao_atividade = ClasseAtividade.INATIVA
                  elif atividade_calculada >= 0.75 and atividade_calculada <= 1.25:
-                     classificacao_atividade = "Normal"
+                     classificacao_atividade = ClasseAtividade.NORMAL
                  else: # Ia > 1.25
-                     classificacao_atividade = "Ativa"
+                     classificacao_atividade = ClasseAtividade.ATIVA
             elif ip_calculado > 1e-9: # Se %argila=0 mas IP>0, atividade seria infinita? Ou indefinida?
                  # Na prática, se %argila=0, o solo não deveria ter IP>0. Indica inconsistência.
                  # Poderia retornar um erro ou aviso. Vamos retornar como None.
                  pass
             else: # %argila=0 e IP=0
                  # Atividade é 0/0 (indefinido) ou simplesmente não aplicável.
-                 classificacao_atividade = "Não aplicável (solo NP ou sem argila)"
+                 classificacao_atividade = ClasseAtividade.NAO_APLICAVEL
 
 
         # --- Preparar Saída ---
         precisao = 2 # Duas casas decimais para os limites
-        return LimitesConsistenciaOutput(
+        return LimitesConsistenciaOutput.model_construct(
             ll=round(ll_calculado, precisao),
             lp=round(lp_calculado, precisao),
             ip=round(ip_calculado, precisao),
@@ -164,12 +183,11 @@ def calcular_limites_consistencia(dados: LimitesConsistenciaInput) -> LimitesCon
             classificacao_consistencia=classificacao_consistencia,
             atividade_argila=round(atividade_calculada, precisao) if atividade_calculada is not None else None,
             classificacao_atividade=classificacao_atividade,
-            pontos_grafico_ll=pontos_grafico_ll_log # Retorna (log_golpes, umidade)
+            pontos_grafico_ll=_pontos_curva(curva_ll) # Retorna (log_golpes, umidade)
         )
 
     except ValueError as ve:
-        return LimitesConsistenciaOutput(erro=str(ve))
+        return LimitesConsistenciaOutput.model_construct(erro=str(ve))
     except Exception as e:
-        import traceback
-        print(f"Erro inesperado no cálculo de limites de consistência: {e}\n{traceback.format_exc()}")
-        return LimitesConsistenciaOutput(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("Erro inesperado no cálculo de limites de consistência: %s", e)
+        return LimitesConsistenciaOutput.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
@@ -1,10 +1,24 @@
 # backend/app/modules/recalque_adensamento.py
-import numpy as np
-from app.models import RecalqueAdensamentoInput, RecalqueAdensamentoOutput
-from typing import Optional
+from app.models import EstadoAdensamento, RecalqueAdensamentoInput, RecalqueAdensamentoOutput
+from app.log import logger
+from app.modules._kernels import ADENSAMENTO_PA_VIRGEM, recalque_adensamento_nucleo
 
 EPSILON = 1e-9 # Pequena tolerância
 
+# Por código de caso do núcleo (NA, PA só recompressão, PA com trecho virgem, sub-adensado)
+_ESTADOS = (
+    EstadoAdensamento.NORMALMENTE_ADENSADO,
+    EstadoAdensamento.PRE_ADENSADO,
+    EstadoAdensamento.PRE_ADENSADO,
+    EstadoAdensamento.SUB_ADENSADO,
+)
+_ERROS_TENSAO_NULA = (
+    "Tensão efetiva inicial não pode ser zero para solo NA.",
+    "Tensão efetiva inicial não pode ser zero.",
+    "Tensões inicial e de pré-adensamento devem ser maiores que zero.",
+    "Tensão efetiva inicial não pode ser zero.",
+)
+
 def calcular_recalque_adensamento(dados: RecalqueAdensamentoInput) -> RecalqueAdensamentoOutput:
     """
     Calcula o recalque total por adensamento primário (ΔH) para uma camada
@@ -36,58 +50,23 @@ def calcular_recalque_adensamento(dados: RecalqueAdensamentoInput) -> RecalqueAd
             # print("Aviso: Cr (Índice de Recompressão) é maior que Cc (Índice de Compressão).")
             pass
 
-        # Calcula tensão efetiva final
+        # Núcleo numérico (compilado com Numba quando disponível): ΔH, εv, RPA e o caso de adensamento
+        recalque_total, epsilon_v, RPA, caso = recalque_adensamento_nucleo(
+            H0, e0, Cc, Cr, sigma_v0_prime, sigma_vm_prime, delta_sigma_prime)
+        if sigma_v0_prime <= EPSILON or (caso == ADENSAMENTO_PA_VIRGEM and sigma_vm_prime <= EPSILON):
+            raise ValueError(_ERROS_TENSAO_NULA[caso])
         sigma_vf_prime = sigma_v0_prime + delta_sigma_prime
 
-        # Calcula Razão de Pré-Adensamento (RPA ou OCR)
-        RPA = sigma_vm_prime / sigma_v0_prime
-
-        # Determina o estado de adensamento e calcula a deformação volumétrica (εv)
-        epsilon_v: float = 0.0
-        estado_adensamento: str = ""
-
-        # Caso 1: Solo Normalmente Adensado (NA)
-        # Consideramos NA se RPA estiver próximo de 1 (ex: entre 0.95 e 1.1)
-        if abs(RPA - 1.0) < 0.1: # Tolerância para considerar NA
-            estado_adensamento = "Normalmente Adensado (RPA ≈ 1)"
-            if sigma_v0_prime <= EPSILON: raise ValueError("Tensão efetiva inicial não pode ser zero para solo NA.")
-            epsilon_v = (Cc / (1 + e0)) * np.log10(sigma_vf_prime / sigma_v0_prime) #
-
-        # Caso 2: Solo Pré-Adensado (PA)
-        elif RPA > 1.0:
-            estado_adensamento = "Pré-Adensado (RPA > 1)"
-            # Caso 2a: Tensão final NÃO excede a tensão de pré-adensamento
-            if sigma_vf_prime <= sigma_vm_prime:
-                if sigma_v0_prime <= EPSILON: raise ValueError("Tensão efetiva inicial não pode ser zero.")
-                epsilon_v = (Cr / (1 + e0)) * np.log10(sigma_vf_prime / sigma_v0_prime) #
-            # Caso 2b: Tensão final EXCEDE a tensão de pré-adensamento
-            else:
-                 if sigma_v0_prime <= EPSILON or sigma_vm_prime <= EPSILON:
-                      raise ValueError("Tensões inicial e de pré-adensamento devem ser maiores que zero.")
-                 # Deformação na faixa de recompressão + deformação na faixa virgem
-                 epsilon_v = (Cr / (1 + e0)) * np.log10(sigma_vm_prime / sigma_v0_prime) + \
-                             (Cc / (1 + e0)) * np.log10(sigma_vf_prime / sigma_vm_prime) #
-
-        # Caso 3: Solo Sub-Adensado (RPA < 1) - Menos comum, tratar como NA?
-        else: # RPA < 1 (considerando a tolerância anterior)
-             estado_adensamento = "Sub-Adensado (RPA < 1) - Cálculo como Normalmente Adensado"
-             # O cálculo é similar ao NA, mas o estado inicial já está na curva virgem
-             if sigma_v0_prime <= EPSILON: raise ValueError("Tensão efetiva inicial não pode ser zero.")
-             epsilon_v = (Cc / (1 + e0)) * np.log10(sigma_vf_prime / sigma_v0_prime)
-
-        # Calcula o recalque total primário
-        recalque_total = epsilon_v * H0 #
-
-        return RecalqueAdensamentoOutput(
+        return RecalqueAdensamentoOutput.model_construct(
             recalque_total_primario=round(recalque_total, 4), # Em metros, 4 casas decimais
             deformacao_volumetrica=round(epsilon_v, 5),
             tensao_efetiva_final=round(sigma_vf_prime, 2),
-            estado_adensamento=estado_adensamento,
+            estado_adensamento=_ESTADOS[caso],
             RPA=round(RPA, 2)
         )
 
     except ValueError as ve:
-        return RecalqueAdensamentoOutput(erro=str(ve))
+        return RecalqueAdensamentoOutput.model_construct(erro=str(ve))
     except Exception as e:
-        print(f"Erro inesperado no cálculo de recalque: {e}")
-        return RecalqueAdensamentoOutput(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("Erro inesperado no cálculo de recalque: %s", e)
+        return RecalqueAdensamentoOutput.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
@@ -1,23 +1,26 @@
 # backend/app/modules/tempo_adensamento.py
+import math
 import numpy as np
 from app.models import TempoAdensamentoInput, TempoAdensamentoOutput
+from app.log import logger
 from typing import Optional
 
-PI = np.pi
+PI = math.pi
 EPSILON = 1e-9
+_LN10_SOBRE_0933 = math.log(10.0) / 0.933 # ln(10)/0.933, da relação Tv = -0.933*log10(1-U) - 0.085
 
 def calcular_Tv_de_Uz(Uz_percent: float) -> Optional[float]:
     """ Calcula o Fator Tempo (Tv) a partir do Grau de Adensamento Médio (Uz) em %. """
     if Uz_percent < 0 or Uz_percent > 100:
         return None
-    if np.isclose(Uz_percent, 100.0):
+    if math.isclose(Uz_percent, 100.0, rel_tol=1e-5, abs_tol=1e-8): # Tolerâncias padrão do np.isclose
         return float('inf') # Teoricamente infinito para 100%
 
     Uz = Uz_percent / 100.0
     if Uz <= 0.60: # Para U <= 60%
-        Tv = (PI / 4) * (Uz**2) #
+        Tv = (PI / 4) * (Uz * Uz) #
     else: # Para U > 60%
-        Tv = -0.933 * np.log10(1 - Uz) - 0.085 #
+        Tv = -0.933 * math.log10(1 - Uz) - 0.085 #
     return Tv
 
 def calcular_Uz_de_Tv(Tv: float) -> Optional[float]:
@@ -29,24 +32,29 @@ def calcular_Uz_de_Tv(Tv: float) -> Optional[float]:
 
     if Tv <= 0.283: # Corresponde a U ~ 60%
         # Tv = (PI/4) * U^2 => U = sqrt(4*Tv / PI)
-        Uz = np.sqrt(4 * Tv / PI)
+        Uz = math.sqrt(4 * Tv / PI)
     else:
         # Tv = -0.933 * log10(1 - U) - 0.085 => log10(1 - U) = (Tv + 0.085) / -0.933
         # 1 - U = 10**((Tv + 0.085) / -0.933) => U = 1 - 10**(-(Tv + 0.085) / 0.933)
-        try:
-            # Verifica se o expoente não é muito grande para evitar overflow/underflow
-            exponent = -(Tv + 0.085) / 0.933
-            if exponent < -30: # Limite prático para evitar 1 - ~0 = 1
-                Uz = 1.0
-            else:
-                 Uz = 1 - (10**exponent)
-        except OverflowError:
-             Uz = 1.0 # Aproxima para 100% se o cálculo falhar por overflow
+        # 10**x = exp(x * ln 10): expm1 evita o pow e já devolve 1 - 10**x; para Tv grande
+        # o expoente só satura (expm1 -> -1, Uz -> 1.0), sem overflow
+        Uz = -math.expm1(-(Tv + 0.085) * _LN10_SOBRE_0933)
 
-    # Garante que Uz esteja entre 0 e 1, depois converte para percentagem
-    Uz = np.clip(Uz, 0, 1)
+    # Uz já sai em [0, 1] pelas duas fórmulas (raiz <= ~0.60; -expm1 de expoente negativo em (0, 1]),
+    # sem precisar de limitar: só converte para percentagem
     return Uz * 100
 
+def calcular_Uz_de_Tv_batch(Tv: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `calcular_Uz_de_Tv` (ex: curva Uz x tempo para gráficos).
+    Aceita escalar ou array; Tv negativo (None na versão escalar) resulta em NaN.
+    """
+    Tv = np.asarray(Tv, dtype=np.float64)
+    with np.errstate(invalid='ignore', over='ignore'): # Tv < 0 na raiz; Tv enorme satura em Uz = 100%
+        Uz = np.where(Tv <= 0.283, np.sqrt(4 * Tv / PI), -np.expm1(-(Tv + 0.085) * _LN10_SOBRE_0933))
+    # Como na versão escalar, Uz já sai em [0, 1] pelas duas fórmulas: não precisa de limitar
+    return np.where(Tv < 0, np.nan, Uz * 100)
+
 def calcular_tempo_adensamento(dados: TempoAdensamentoInput) -> TempoAdensamentoOutput:
     """
     Realiza a análise do tempo de adensamento primário.
@@ -59,6 +67,7 @@ def calcular_tempo_adensamento(dados: TempoAdensamentoInput) -> TempoAdensamento
         delta_H_total = dados.recalque_total_primario
         Cv = dados.coeficiente_adensamento
         Hd = dados.altura_drenagem
+        Hd2 = Hd * Hd # Hd², usado nas duas relações Tv = Cv*t/Hd²
 
         if delta_H_total <= 0 or Cv <= 0 or Hd <= 0:
             raise ValueError("Recalque total, Cv e Hd devem ser positivos.")
@@ -78,12 +87,12 @@ def calcular_tempo_adensamento(dados: TempoAdensamentoInput) -> TempoAdensamento
             Tv_calculado = calcular_Tv_de_Uz(Uz_desejado)
             if Tv_calculado is None:
                 raise ValueError("Grau de adensamento médio inválido (deve ser entre 0 e 100).")
-            if np.isinf(Tv_calculado):
+            if math.isinf(Tv_calculado):
                 tempo_calculado = float('inf')
                 recalque_no_tempo = delta_H_total
                 Uz_calculado = 100.0
             else:
-                tempo_calculado = (Tv_calculado * (Hd**2)) / Cv #
+                tempo_calculado = (Tv_calculado * Hd2) / Cv #
                 recalque_no_tempo = (Uz_desejado / 100.0) * delta_H_total
                 Uz_calculado = Uz_desejado
 
@@ -96,7 +105,7 @@ def calcular_tempo_adensamento(dados: TempoAdensamentoInput) -> TempoAdensamento
                 Uz_calculado = 0.0
                 recalque_no_tempo = 0.0
             else:
-                Tv_calculado = (Cv * tempo) / (Hd**2) #
+                Tv_calculado = (Cv * tempo) / Hd2 #
                 Uz_calculado = calcular_Uz_de_Tv(Tv_calculado)
                 if Uz_calculado is None:
                     # Isso não deve acontecer se Tv >= 0
@@ -105,15 +114,15 @@ def calcular_tempo_adensamento(dados: TempoAdensamentoInput) -> TempoAdensamento
             tempo_calculado = tempo # O tempo foi dado como entrada
 
 
-        return TempoAdensamentoOutput(
-            tempo_calculado=round(tempo_calculado, 3) if tempo_calculado is not None and np.isfinite(tempo_calculado) else tempo_calculado,
+        return TempoAdensamentoOutput.model_construct(
+            tempo_calculado=round(tempo_calculado, 3) if tempo_calculado is not None and math.isfinite(tempo_calculado) else tempo_calculado,
             recalque_no_tempo=round(recalque_no_tempo, 4) if recalque_no_tempo is not None else None,
             grau_adensamento_medio_calculado=round(Uz_calculado, 2) if Uz_calculado is not None else None,
-            fator_tempo=round(Tv_calculado, 4) if Tv_calculado is not None and np.isfinite(Tv_calculado) else Tv_calculado
+            fator_tempo=round(Tv_calculado, 4) if Tv_calculado is not None and math.isfinite(Tv_calculado) else Tv_calculado
         )
 
     except ValueError as ve:
-        return TempoAdensamentoOutput(erro=str(ve))
+        return TempoAdensamentoOutput.model_construct(erro=str(ve))
     except Exception as e:
-        print(f"Erro inesperado no cálculo de tempo de adensamento: {e}")
-        return TempoAdensamentoOutput(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("Erro inesperado no cálculo de tempo de adensamento: %s", e)
+        return TempoAdensamentoOutput.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
@@ -1,7 +1,58 @@
+import math
+from bisect import bisect_left
+
 import numpy as np
 from typing import List, Optional
 # Importa os modelos Pydantic do ficheiro centralizado
 from app.models import CamadaSolo, TensaoPonto, TensoesGeostaticasInput, TensoesGeostaticasOutput
+from app.log import logger
+from app.modules._arredondamento import arredondar_casas
+from app.modules._kernels import PERFIL_GEOSTATICO_COMPILADO, tensoes_geostaticas_perfil
+
+# Propriedades das camadas num array estruturado (γ ausente vira NaN)
+DTYPE_CAMADAS = np.dtype([('espessura', 'f8'), ('gama_nat', 'f8'), ('gama_sat', 'f8'), ('Ko', 'f8')])
+
+def _camadas_para_array(camadas: List[CamadaSolo]) -> np.ndarray:
+    """ Converte a lista de camadas num array estruturado (uma linha por camada). """
+    return np.array(
+        [(c.espessura, np.nan if c.gama_nat is None else c.gama_nat,
+          np.nan if c.gama_sat is None else c.gama_sat, c.Ko) for c in camadas],
+        dtype=DTYPE_CAMADAS
+    )
+
+def _perfil_geostatico_numpy(
+    espessuras: np.ndarray,
+    gamas_nat: np.ndarray,
+    gamas_sat: np.ndarray,
+    Kos: np.ndarray,
+    z_base: np.ndarray,
+    z_topo: np.ndarray,
+    acima_na: np.ndarray,
+    abaixo_na: np.ndarray,
+    na: float,
+    altura_capilar: float,
+    gama_w: float
+):
+    """ Versão vetorizada de `tensoes_geostaticas_perfil`, usada quando não há núcleo compilado (AOT ou Numba). """
+    # --- Tensão Total na Base de cada Camada ---
+    # Camada atravessada: parte acima do NA com γnat e parte abaixo com γsat
+    contribuicao_acima_na = np.where(acima_na, espessuras, na - z_topo) * gamas_nat
+    contribuicao = np.where(acima_na, contribuicao_acima_na,
+                            np.where(abaixo_na, gamas_sat * espessuras, contribuicao_acima_na + gamas_sat * (z_base - na)))
+    tensao_total = np.cumsum(contribuicao)
+
+    # --- Pressão Neutra e Tensão Efetiva na Base de cada Camada ---
+    # Distância vertical da base da camada até o NA; considera capilaridade
+    # (u = -γw * h dentro da franja capilar, 0 acima dela). Com altura capilar >= 0, "abaixo do
+    # NA ou dentro da franja" é uma única comparação: distância >= -altura capilar
+    distancia_vertical_na = z_base - na
+    pressao_neutra = np.where(distancia_vertical_na >= -altura_capilar, distancia_vertical_na * gama_w, 0.0)
+
+    tensao_efetiva_vertical = tensao_total - pressao_neutra
+    # Garante que não seja negativa devido a erros de precisão ou capilaridade muito alta
+    tensao_efetiva_vertical[tensao_efetiva_vertical < -1e-9] = 0.0
+    tensao_efetiva_horizontal = tensao_efetiva_vertical * Kos
+    return tensao_total, pressao_neutra, tensao_efetiva_vertical, tensao_efetiva_horizontal
 
 def calcular_tensoes_geostaticas(dados: TensoesGeostaticasInput) -> TensoesGeostaticasOutput:
     """
@@ -13,140 +64,94 @@ def calcular_tensoes_geostaticas(dados: TensoesGeostaticasInput) -> TensoesGeost
     Referências:
     - PDF: 8. Tenses_no_Solo-Maio_2022-1.pdf (Págs. 3-13, 27-32)
     """
-    pontos_calculo: List[TensaoPonto] = []
-    profundidade_atual: float = 0.0
-    tensao_total_atual: float = 0.0
+    # Parâmetros do perfil lidos do modelo uma única vez
     gama_w = dados.peso_especifico_agua
+    na = dados.profundidade_na
+    altura_capilar = dados.altura_capilar
 
     try:
         if not dados.camadas:
              raise ValueError("A lista de camadas não pode estar vazia.")
 
         # Ponto inicial na superfície
-        # Calcula pressão neutra inicial considerando capilaridade
-        u_inicial = 0.0
-        if dados.profundidade_na <= 0 and dados.altura_capilar > 0: # NA na superfície ou acima
-            # Considera apenas a parte da capilaridade acima da superfície (se houver)
-            # Neste caso simplificado, se NA=0, a pressão na superfície é negativa pela capilaridade
-             u_inicial = -min(dados.altura_capilar, 0) * gama_w # Será 0 se NA=0, mas pode ser negativa se NA < 0
-             # Para o caso NA=0 exato, a pressão é -altura_capilar*gama_w, mas só se z<altura_capilar
-             # Na superfície (z=0), se NA=0, u = -altura_capilar*gama_w *apenas* se h_capilar > 0
-             u_inicial = -dados.altura_capilar * gama_w if dados.altura_capilar > 0 else 0.0
-
-
+        # Pressão neutra inicial: com o NA na superfície, a franja capilar deixa u negativa em z=0
+        u_inicial = -altura_capilar * gama_w if na <= 0 and altura_capilar > 0 else 0.0
         sigma_ef_v_inicial = 0.0 - u_inicial
         sigma_ef_h_inicial = sigma_ef_v_inicial * dados.camadas[0].Ko # Usa Ko da primeira camada
 
-        pontos_calculo.append(TensaoPonto(
-            profundidade=0.0,
-            tensao_total_vertical=0.0,
-            pressao_neutra=u_inicial,
-            tensao_efetiva_vertical=sigma_ef_v_inicial,
-            tensao_efetiva_horizontal=sigma_ef_h_inicial
-        ))
-
-
-        for i, camada in enumerate(dados.camadas):
-            profundidade_base_camada = profundidade_atual + camada.espessura
-            z_topo = profundidade_atual
-            z_base = profundidade_base_camada
-
-            # --- Calcular Tensão Total na Base da Camada ---
-            if z_base <= dados.profundidade_na: # Camada inteira acima do NA
-                gama_camada = camada.gama_nat
-                if gama_camada is None:
-                    raise ValueError(f"Peso específico natural (γnat) não definido para a camada {i+1} (ID: {i}) que está acima do NA (Prof: {z_topo:.2f}-{z_base:.2f} m, NA: {dados.profundidade_na:.2f} m).")
-                tensao_total_atual += gama_camada * camada.espessura
-
-            elif z_topo >= dados.profundidade_na: # Camada inteira abaixo do NA
-                gama_camada = camada.gama_sat
-                if gama_camada is None:
-                    raise ValueError(f"Peso específico saturado (γsat) não definido para a camada {i+1} (ID: {i}) que está abaixo do NA (Prof: {z_topo:.2f}-{z_base:.2f} m, NA: {dados.profundidade_na:.2f} m).")
-                tensao_total_atual += gama_camada * camada.espessura
-
-            else: # Camada atravessada pelo NA
-                espessura_acima_na = dados.profundidade_na - z_topo
-                espessura_abaixo_na = z_base - dados.profundidade_na
-
-                gama_nat_camada = camada.gama_nat
-                gama_sat_camada = camada.gama_sat
-
-                if gama_nat_camada is None:
-                     raise ValueError(f"Peso específico natural (γnat) não definido para a camada {i+1} (ID: {i}) que é atravessada pelo NA (NA: {dados.profundidade_na:.2f} m).")
-                if gama_sat_camada is None:
-                     raise ValueError(f"Peso específico saturado (γsat) não definido para a camada {i+1} (ID: {i}) que é atravessada pelo NA (NA: {dados.profundidade_na:.2f} m).")
-
-                # Adiciona contribuição da parte acima do NA
-                tensao_total_na_interface = tensao_total_atual + gama_nat_camada * espessura_acima_na
-
-                # Adiciona ponto de cálculo exatamente no NA se ele corta a camada
-                u_no_na = 0.0 # Por definição
-                sigma_v_no_na = tensao_total_na_interface
-                sigma_ef_v_no_na = sigma_v_no_na - u_no_na
-                sigma_ef_h_no_na = sigma_ef_v_no_na * camada.Ko
-                # Evita duplicar se o NA coincide com interface de camadas
-                if not any(np.isclose(p.profundidade, dados.profundidade_na) for p in pontos_calculo):
-                    pontos_calculo.append(TensaoPonto(
-                        profundidade=dados.profundidade_na,
-                        tensao_total_vertical=round(sigma_v_no_na, 4),
-                        pressao_neutra=round(u_no_na, 4),
-                        tensao_efetiva_vertical=round(sigma_ef_v_no_na, 4),
-                        tensao_efetiva_horizontal=round(sigma_ef_h_no_na, 4)
-                    ))
-
-                # Adiciona contribuição da parte abaixo do NA para chegar na base da camada
-                tensao_total_atual = tensao_total_na_interface + gama_sat_camada * espessura_abaixo_na
-
-            # --- Calcular Pressão Neutra e Tensão Efetiva na Base da Camada ---
-            # Distância vertical da base da camada até o NA
-            distancia_vertical_na = z_base - dados.profundidade_na
-
-            # Considera capilaridade
-            if distancia_vertical_na >= 0: # Abaixo ou no NA
-                pressao_neutra = distancia_vertical_na * gama_w
-            elif abs(distancia_vertical_na) <= dados.altura_capilar: # Dentro da franja capilar
-                 # u = -γw * h (onde h é a altura acima do NA, que é -distancia_vertical_na)
-                 pressao_neutra = distancia_vertical_na * gama_w # Já é negativo
-            else: # Acima da franja capilar
-                pressao_neutra = 0.0
-
-            tensao_efetiva_vertical = tensao_total_atual - pressao_neutra
-            # Garante que não seja negativa devido a erros de precisão ou capilaridade muito alta
-            if tensao_efetiva_vertical < -1e-9: # Pequena tolerância para zero
-                 # Isso pode acontecer se a capilaridade for muito alta ou γnat baixo
-                 # Pode ser um aviso, mas para cálculo, limitamos a zero
-                 # print(f"Aviso: Tensão efetiva vertical calculada negativa ({tensao_efetiva_vertical:.4f}) na profundidade {z_base:.2f} m. Limitando a 0.")
-                 tensao_efetiva_vertical = 0.0
-
-            tensao_efetiva_horizontal = tensao_efetiva_vertical * camada.Ko
-
-            # Adiciona ponto de cálculo na base da camada
-            pontos_calculo.append(TensaoPonto(
-                profundidade=round(profundidade_base_camada, 4),
-                tensao_total_vertical=round(tensao_total_atual, 4),
-                pressao_neutra=round(pressao_neutra, 4),
-                tensao_efetiva_vertical=round(tensao_efetiva_vertical, 4),
-                tensao_efetiva_horizontal=round(tensao_efetiva_horizontal, 4)
-            ))
-
-            profundidade_atual = profundidade_base_camada
-
-        # Ordena os pontos por profundidade para garantir a ordem correta para plotagem
-        pontos_calculo.sort(key=lambda p: p.profundidade)
-
-        # Remove pontos duplicados de profundidade (pode ocorrer se NA = interface)
-        pontos_unicos = []
-        profundidades_vistas = set()
-        for ponto in pontos_calculo:
-            if round(ponto.profundidade, 4) not in profundidades_vistas:
-                pontos_unicos.append(ponto)
-                profundidades_vistas.add(round(ponto.profundidade, 4))
-
-        return TensoesGeostaticasOutput(pontos_calculo=pontos_unicos)
+        # --- Perfil inteiro calculado de uma vez sobre o array estruturado das camadas ---
+        camadas = _camadas_para_array(dados.camadas)
+        espessuras = camadas['espessura']
+        gamas_nat = camadas['gama_nat']
+        gamas_sat = camadas['gama_sat']
+
+        z_base = np.cumsum(espessuras)
+        z_topo = np.concatenate(([0.0], z_base[:-1]))
+
+        acima_na = z_base <= na # Camada inteira acima do NA
+        abaixo_na = ~acima_na & (z_topo >= na) # Camada inteira abaixo do NA
+        atravessada = ~acima_na & ~abaixo_na # Camada atravessada pelo NA
+
+        # γ ausente (NaN) onde é necessário: erro na primeira camada afetada
+        sem_gama_nat = (acima_na | atravessada) & np.isnan(gamas_nat)
+        sem_gama_sat = (abaixo_na | atravessada) & np.isnan(gamas_sat)
+        invalidas = np.flatnonzero(sem_gama_nat | sem_gama_sat)
+        if invalidas.size:
+            i = int(invalidas[0])
+            if acima_na[i]:
+                raise ValueError(f"Peso específico natural (γnat) não definido para a camada {i+1} (ID: {i}) que está acima do NA (Prof: {z_topo[i]:.2f}-{z_base[i]:.2f} m, NA: {na:.2f} m).")
+            if abaixo_na[i]:
+                raise ValueError(f"Peso específico saturado (γsat) não definido para a camada {i+1} (ID: {i}) que está abaixo do NA (Prof: {z_topo[i]:.2f}-{z_base[i]:.2f} m, NA: {na:.2f} m).")
+            if sem_gama_nat[i]:
+                raise ValueError(f"Peso específico natural (γnat) não definido para a camada {i+1} (ID: {i}) que é atravessada pelo NA (NA: {na:.2f} m).")
+            raise ValueError(f"Peso específico saturado (γsat) não definido para a camada {i+1} (ID: {i}) que é atravessada pelo NA (NA: {na:.2f} m).")
+
+        # --- σv, u, σ'v e σ'h na base de cada camada (array 4 x n) ---
+        if PERFIL_GEOSTATICO_COMPILADO:
+            # Núcleo compilado (AOT ou JIT): um único laço sobre as camadas, escrevendo direto nas linhas
+            tensoes_bases = np.empty((4, z_base.size))
+            tensoes_geostaticas_perfil(espessuras, gamas_nat, gamas_sat, camadas['Ko'], z_base, na,
+                                       altura_capilar, gama_w, *tensoes_bases)
+        else:
+            tensoes_bases = np.stack(_perfil_geostatico_numpy(espessuras, gamas_nat, gamas_sat, camadas['Ko'], z_base,
+                                                              z_topo, acima_na, abaixo_na, na, altura_capilar, gama_w))
+        # Camada atravessada pelo NA (no máximo uma) e σv no topo dela, lida antes do arredondamento
+        i_na = np.flatnonzero(atravessada)
+        tensao_total_topo_na = float(tensoes_bases[0, i_na[0] - 1]) if i_na.size and i_na[0] > 0 else 0.0
+
+        # Pontos (z, σv, u, σ'v, σ'h): superfície e base de cada camada arredondada a 4 casas,
+        # já em ordem de profundidade
+        bases = np.vstack((z_base, tensoes_bases))
+        arredondar_casas(bases, 4)
+        linhas = bases.tolist()
+        pontos = [(0.0, 0.0, u_inicial, sigma_ef_v_inicial, sigma_ef_h_inicial), *zip(*linhas)]
+        # Profundidade arredondada de cada ponto, paralela a `pontos` (chave da deduplicação)
+        profundidades = [0.0, *linhas[0]]
+
+        # Ponto exatamente no NA, se ele corta uma camada
+        if i_na.size:
+            i = int(i_na[0])
+            # Evita duplicar se o NA coincide com a superfície ou uma base anterior
+            if not any(math.isclose(z, na, rel_tol=1e-5, abs_tol=1e-8) for z in profundidades[:i + 1]):
+                # Camada atravessada: só a parte acima do NA, com γnat
+                sigma_v_no_na = tensao_total_topo_na + (na - float(z_topo[i])) * float(gamas_nat[i])
+                ponto_na = (na, round(sigma_v_no_na, 4), 0.0, round(sigma_v_no_na, 4), # u = 0 no NA, por definição
+                            round(sigma_v_no_na * float(camadas['Ko'][i]), 4))
+                # Antes de uma base com a mesma profundidade, que a deduplicação abaixo descarta
+                posicao = bisect_left(profundidades, na)
+                pontos.insert(posicao, ponto_na)
+                profundidades.insert(posicao, round(na, 4))
+
+        # Descarta profundidades repetidas após arredondar (pode ocorrer se NA = interface):
+        # com os pontos em ordem, basta comparar cada um com o anterior
+        pontos_unicos = [TensaoPonto(*ponto) for ponto, z, z_anterior in zip(pontos, profundidades, [None, *profundidades])
+                         if z != z_anterior]
+
+        # Pontos gerados aqui mesmo: model_construct dispensa revalidar a lista
+        return TensoesGeostaticasOutput.model_construct(pontos_calculo=pontos_unicos)
 
     except ValueError as ve:
-        return TensoesGeostaticasOutput(pontos_calculo=[], erro=str(ve))
+        return TensoesGeostaticasOutput.model_construct(pontos_calculo=[], erro=str(ve))
     except Exception as e:
-        import traceback
-        print(f"Erro inesperado no cálculo de tensões geostáticas: {e}\n{traceback.format_exc()}")
-        return TensoesGeostaticasOutput(pontos_calculo=[], erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
+        logger.exception("Erro inesperado no cálculo de tensões geostáticas: %s", e)
+        return TensoesGeostaticasOutput.model_construct(pontos_calculo=[], erro=f"Erro interno no servidor: {type(e).__name__}")
\ No newline at end of file
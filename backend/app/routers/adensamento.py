@@ -0,0 +1,33 @@
+# backend/app/routers/adensamento.py
+from fastapi import APIRouter
+
+from app.models import (
+    RecalqueAdensamentoInput, RecalqueAdensamentoOutput,
+    TempoAdensamentoInput, TempoAdensamentoOutput,
+    RecalqueAdensamentoBatchInput, RecalqueAdensamentoBatchOutput,
+    TempoAdensamentoBatchInput, TempoAdensamentoBatchOutput
+)
+from app.modules.recalque_adensamento import calcular_recalque_adensamento
+from app.modules.tempo_adensamento import calcular_tempo_adensamento
+from app.routers.comum import calcular_lote, responder
+
+router = APIRouter()
+
+
+@router.post("/recalque-adensamento", response_model=RecalqueAdensamentoOutput)
+async def post_calcular_recalque(dados_entrada: RecalqueAdensamentoInput):
+    return await responder(calcular_recalque_adensamento, dados_entrada)
+
+@router.post("/tempo-adensamento", response_model=TempoAdensamentoOutput)
+async def post_calcular_tempo_adensamento(dados_entrada: TempoAdensamentoInput):
+    return await responder(calcular_tempo_adensamento, dados_entrada)
+
+# --- Lote ---
+
+@router.post("/recalque-adensamento/batch", response_model=RecalqueAdensamentoBatchOutput, tags=["Lote"])
+async def post_calcular_recalque_batch(dados_entrada: RecalqueAdensamentoBatchInput):
+    return await calcular_lote(RecalqueAdensamentoBatchOutput, RecalqueAdensamentoInput, calcular_recalque_adensamento, dados_entrada.itens)
+
+@router.post("/tempo-adensamento/batch", response_model=TempoAdensamentoBatchOutput, tags=["Lote"])
+async def post_calcular_tempo_adensamento_batch(dados_entrada: TempoAdensamentoBatchInput):
+    return await calcular_lote(TempoAdensamentoBatchOutput, TempoAdensamentoInput, calcular_tempo_adensamento, dados_entrada.itens)
@@ -0,0 +1,27 @@
+# backend/app/routers/classificacao.py
+from fastapi import APIRouter
+
+from app.models import (
+    ClassificacaoUSCSInput, ClassificacaoUSCSOutput,
+    ClassificacaoUSCSBatchInput, ClassificacaoUSCSBatchOutput
+)
+from app.modules.classificacao_uscs import classificar_uscs
+from app.routers.comum import calcular_lote, responder
+
+router = APIRouter()
+
+
+@router.post("/uscs", response_model=ClassificacaoUSCSOutput)
+async def post_classificar_uscs(dados_entrada: ClassificacaoUSCSInput):
+    """
+    Classifica o solo de acordo com o Sistema Unificado (USCS).
+    Forneça os dados granulométricos e limites de Atterberg.
+    Cu e Cc são necessários para solos grossos com < 5% de finos ou classificação dupla.
+    """
+    return await responder(classificar_uscs, dados_entrada)
+
+# --- Lote ---
+
+@router.post("/uscs/batch", response_model=ClassificacaoUSCSBatchOutput, tags=["Lote"])
+async def post_classificar_uscs_batch(dados_entrada: ClassificacaoUSCSBatchInput):
+    return await calcular_lote(ClassificacaoUSCSBatchOutput, ClassificacaoUSCSInput, classificar_uscs, dados_entrada.itens)
@@ -0,0 +1,19 @@
+# backend/app/routers/compactacao.py
+from fastapi import APIRouter
+
+from app.models import CompactacaoInput, CompactacaoOutput, CompactacaoBatchInput, CompactacaoBatchOutput
+from app.modules.compactacao import calcular_compactacao
+from app.routers.comum import calcular_lote, responder
+
+router = APIRouter()
+
+
+@router.post("/compactacao", response_model=CompactacaoOutput)
+async def post_calcular_compactacao(dados_entrada: CompactacaoInput):
+    return await responder(calcular_compactacao, dados_entrada)
+
+# --- Lote ---
+
+@router.post("/compactacao/batch", response_model=CompactacaoBatchOutput, tags=["Lote"])
+async def post_calcular_compactacao_batch(dados_entrada: CompactacaoBatchInput):
+    return await calcular_lote(CompactacaoBatchOutput, CompactacaoInput, calcular_compactacao, dados_entrada.itens)
@@ -0,0 +1,135 @@
+# backend/app/routers/comum.py
+"""
+Execução compartilhada pelos routers: cálculo fora do event loop (threadpool ou,
+opcionalmente, pool de processos), respostas serializadas em cache LRU e
+processamento de lotes.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Type, get_args
+
+from fastapi import HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
+
+from app.cache import cache_respostas, calcular_com_cache, chave_cache
+from app.log import iniciar_log_processo, logger
+
+# Pool de processos para os cálculos (contorna o GIL). None = usa o threadpool.
+_pool_processos: Optional[ProcessPoolExecutor] = None
+
+
+def _iniciar_processo(nivel_log: int) -> None:
+    """ Initializer de cada processo do pool: log direto na saída e aquecimento das calculadoras. """
+    # Import local: app.aquecimento importa os routers, que importam este módulo
+    from app.aquecimento import aquecer_calculadoras
+
+    iniciar_log_processo(nivel_log)
+    try:
+        aquecer_calculadoras()
+    except Exception:
+        logger.exception("Falha ao aquecer as calculadoras no processo do pool")
+
+
+def iniciar_pool_processos(num_processos: int) -> None:
+    """ Cria o pool de processos usado pelos cálculos. Com num_processos <= 0, mantém o threadpool. """
+    global _pool_processos
+    if _pool_processos is None and num_processos > 0:
+        # Processos criados com "spawn", não fork: o fork depois de os núcleos Numba em paralelo
+        # (prange) terem iniciado o pool de threads do TBB deixa o processo principal preso ao sair
+        _pool_processos = ProcessPoolExecutor(max_workers=num_processos, mp_context=multiprocessing.get_context("spawn"),
+                                              initializer=_iniciar_processo, initargs=(logger.getEffectiveLevel(),))
+
+
+def parar_pool_processos() -> None:
+    global _pool_processos
+    if _pool_processos is not None:
+        _pool_processos.shutdown(cancel_futures=True)
+        _pool_processos = None
+
+
+async def executar(funcao: Callable, *args: Any) -> Any:
+    """
+    Executa `funcao(*args)` fora do event loop: no pool de processos, se iniciado,
+    ou no threadpool. A função e os argumentos precisam ser serializáveis (pickle).
+    """
+    if _pool_processos is None:
+        return await run_in_threadpool(funcao, *args)
+    return await asyncio.get_running_loop().run_in_executor(_pool_processos, funcao, *args)
+
+
+def resposta_json(corpo: bytes) -> Response:
+    """
+    Resposta com JSON já serializado. Como é uma Response, o FastAPI não revalida nem
+    reserializa o resultado pelo response_model (que continua a documentar o schema).
+    """
+    return Response(content=corpo, media_type="application/json")
+
+
+def serializar(resultados: BaseModel) -> bytes:
+    """ JSON direto pelo serializador (Rust) do pydantic-core, sem montar o dict intermediário. """
+    return to_json(resultados)
+
+
+async def responder(funcao: Callable[[BaseModel], Any], dados_entrada: BaseModel, erro_como_http: bool = True) -> Response:
+    """
+    Executa o cálculo e devolve a resposta JSON já serializada.
+
+    O corpo serializado fica no cache LRU: uma requisição repetida devolve os mesmos bytes
+    sem recalcular, sem validar o response_model e sem serializar de novo.
+    Com `erro_como_http`, um resultado com `erro` preenchido vira HTTP 400.
+    ValueError levantado pelo cálculo vira HTTP 400; qualquer outra exceção, HTTP 500.
+    """
+    chave = chave_cache(funcao, dados_entrada)
+    resposta = cache_respostas.obter(chave)
+    if resposta is None:
+        try:
+            resultados = await executar(funcao, dados_entrada)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        except Exception as e:
+            logger.exception("Erro inesperado em %s: %s", funcao.__name__, e)
+            raise HTTPException(status_code=500, detail=f"Erro interno no servidor: {type(e).__name__}")
+        erro = resultados.erro if erro_como_http else None
+        resposta = (erro, serializar(resultados))
+        cache_respostas.guardar(chave, resposta)
+
+    erro, corpo = resposta
+    if erro: raise HTTPException(status_code=400, detail=erro)
+    return resposta_json(corpo)
+
+
+def _calcular_item(modelo_entrada: Type[BaseModel], modelo_item: Type[BaseModel], funcao_calculo: Callable, item: Any) -> BaseModel:
+    """ Valida e calcula um item do lote; erros de validação ou do cálculo vão para o `erro` da saída do item. """
+    try:
+        dados = modelo_entrada.model_validate(item)
+        return calcular_com_cache(funcao_calculo, dados)
+    except ValidationError as ve:
+        erros = "; ".join(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" if e['loc'] else e['msg'] for e in ve.errors())
+        return modelo_item.model_construct(erro=f"Entrada inválida: {erros}")
+    except ValueError as ve:
+        return modelo_item.model_construct(erro=str(ve))
+    except Exception as e:
+        logger.exception("Erro inesperado em %s: %s", funcao_calculo.__name__, e)
+        return modelo_item.model_construct(erro=f"Erro interno no servidor: {type(e).__name__}")
+
+
+def _executar_lote(modelo_saida: Type[BaseModel], modelo_entrada: Type[BaseModel], funcao_calculo: Callable, itens: Iterable[Any]) -> BaseModel:
+    """
+    Aplica a função de cálculo a cada item.
+    Os resultados já são modelos validados, por isso o lote é montado com model_construct.
+    """
+    modelo_item = get_args(modelo_saida.model_fields['resultados'].annotation)[0]
+    return modelo_saida.model_construct(resultados=[_calcular_item(modelo_entrada, modelo_item, funcao_calculo, item) for item in itens])
+
+
+async def calcular_lote(modelo_saida: Type[BaseModel], modelo_entrada: Type[BaseModel], funcao_calculo: Callable, itens: Iterable[Any]) -> Response:
+    """
+    Processa vários itens numa única tarefa fora do event loop. Cada item é validado como
+    `modelo_entrada` separadamente: um item inválido (na validação ou no cálculo) não
+    interrompe o lote, o erro é devolvido no campo `erro` da saída correspondente.
+    """
+    lote = await executar(_executar_lote, modelo_saida, modelo_entrada, funcao_calculo, itens)
+    return resposta_json(serializar(lote))
@@ -0,0 +1,160 @@
+# backend/app/routers/fluxo.py
+import numpy as np
+import orjson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.models import FluxoHidraulicoInput, FluxoHidraulicoOutput, FluxoHidraulicoBatchInput, FluxoHidraulicoBatchOutput
+from app.modules.fluxo_hidraulico import (
+    calcular_permeabilidade_equivalente, calcular_velocidades_fluxo,
+    calcular_tensoes_com_fluxo, iter_tensoes_com_fluxo,
+    calcular_gradiente_critico, calcular_fs_liquefacao
+)
+from app.routers.comum import calcular_lote, responder
+
+router = APIRouter()
+
+
+@router.post("/fluxo-hidraulico", response_model=FluxoHidraulicoOutput)
+async def post_analisar_fluxo(dados_entrada: FluxoHidraulicoInput):
+    """
+    Realiza análises de fluxo hidráulico 1D: permeabilidade equivalente,
+    velocidades, gradiente crítico, FS liquefação e tensões sob fluxo.
+    Forneça os dados relevantes para a análise desejada.
+    """
+    # Erros parciais da análise são devolvidos no corpo (campo `erro`), não como HTTP 400
+    return await responder(analisar_fluxo, dados_entrada, erro_como_http=False)
+
+def analisar_fluxo(dados_entrada: FluxoHidraulicoInput) -> FluxoHidraulicoOutput:
+    """
+    Parte síncrona (CPU) da análise de fluxo; executada fora do event loop.
+    O arredondamento dos resultados escalares é feito pelo próprio FluxoHidraulicoOutput.
+    Dados inconsistentes levantam ValueError (convertido em HTTP 400 por `responder`).
+    """
+    output = FluxoHidraulicoOutput()
+
+    # Propriedades das camadas em arrays (SoA), extraídas numa única passagem.
+    # Com dtype float, valores ausentes (None) viram NaN.
+    camadas = dados_entrada.camadas
+    num_camadas = len(camadas)
+    propriedades = np.array([(c.espessura, c.n, c.gamma_sat) for c in camadas], dtype=np.float64).reshape(-1, 3)
+    espessuras, porosidades, gammas_sat = propriedades.T
+    porosidade_completa = num_camadas > 0 and not np.isnan(porosidades).any()
+    gamma_sat_completo = num_camadas > 0 and not np.isnan(gammas_sat).any()
+
+    fluxo_ascendente = bool(dados_entrada.direcao_fluxo_vertical) and dados_entrada.direcao_fluxo_vertical.lower() == 'ascendente'
+    tensoes_solicitadas = bool(
+        dados_entrada.profundidades_tensao and
+        dados_entrada.profundidade_na_entrada is not None and
+        dados_entrada.profundidade_na_saida is not None and
+        dados_entrada.direcao_fluxo_vertical
+    )
+
+    # Calcular permeabilidade equivalente se solicitado
+    # (as camadas já validadas pelo FastAPI são repassadas sem recriar modelos)
+    if dados_entrada.direcao_permeabilidade_equivalente:
+        k_eq = calcular_permeabilidade_equivalente(
+            camadas,
+            dados_entrada.direcao_permeabilidade_equivalente
+        )
+        output.permeabilidade_equivalente = k_eq
+
+    # Calcular velocidades se k_eq (ou k da primeira camada) e gradiente forem dados
+    k_para_velocidade = output.permeabilidade_equivalente
+    if k_para_velocidade is None and camadas:
+        k_para_velocidade = camadas[0].k # Usa k da primeira camada se k_eq não foi calculado
+
+    if k_para_velocidade is not None and dados_entrada.gradiente_hidraulico_aplicado is not None:
+         porosidade_media = None
+         if porosidade_completa:
+             # Média ponderada pela espessura das camadas
+             porosidade_media = float(np.average(porosidades, weights=espessuras))
+
+         velocidades = calcular_velocidades_fluxo(
+             k_para_velocidade,
+             dados_entrada.gradiente_hidraulico_aplicado,
+             porosidade_media
+         )
+         output.velocidade_descarga = velocidades["velocidade_descarga"]
+         output.velocidade_fluxo = velocidades["velocidade_fluxo"]
+
+    # Calcular gradiente crítico e FS (apenas para fluxo ascendente)
+    # Usa gamma_sat da última camada para icrit (ponto de saída do fluxo ascendente)
+    if fluxo_ascendente:
+         if camadas and camadas[-1].gamma_sat:
+             icrit = calcular_gradiente_critico(camadas[-1].gamma_sat, dados_entrada.peso_especifico_agua)
+             output.gradiente_critico = icrit
+             if icrit is not None and dados_entrada.gradiente_hidraulico_aplicado is not None:
+                  # Gradiente atuante para FS deve ser o local na saída, não o médio?
+                  # Por simplicidade, usa o gradiente médio aplicado. Cuidado: pode subestimar FS.
+                  i_atuante = dados_entrada.gradiente_hidraulico_aplicado
+                  fs_liq = calcular_fs_liquefacao(icrit, i_atuante)
+                  output.fs_liquefacao = fs_liq
+         else:
+             output.erro = "γ_sat da última camada necessário para calcular icrit."
+    # Em caso de erro, retorna os resultados já calculados sem executar as etapas seguintes
+    if output.erro:
+        return output
+
+    # Calcular tensões sob fluxo se solicitado (etapa mais cara, por último)
+    if tensoes_solicitadas:
+         # Valida se todas as camadas têm gamma_sat
+         if not gamma_sat_completo:
+             output.erro = "γ_sat deve ser definido para todas as camadas para cálculo de tensões com fluxo."
+         else:
+             pontos_tensao = calcular_tensoes_com_fluxo(
+                 profundidades=dados_entrada.profundidades_tensao,
+                 camadas=camadas,
+                 profundidade_na_entrada=dados_entrada.profundidade_na_entrada,
+                 profundidade_na_saida=dados_entrada.profundidade_na_saida,
+                 gamma_w=dados_entrada.peso_especifico_agua,
+                 direcao_fluxo=dados_entrada.direcao_fluxo_vertical
+             )
+             output.pontos_tensao_fluxo = pontos_tensao
+    if output.erro:
+        return output
+
+    # Verifica se alguma operação foi realizada
+    if not any([output.permeabilidade_equivalente, output.velocidade_descarga, output.gradiente_critico, output.pontos_tensao_fluxo]):
+         output.erro = "Nenhuma análise de fluxo solicitada ou dados insuficientes."
+
+    return output
+
+
+@router.post("/fluxo-hidraulico/stream")
+async def post_analisar_fluxo_stream(dados_entrada: FluxoHidraulicoInput):
+    """
+    Variante em streaming do cálculo de tensões sob fluxo: devolve NDJSON
+    (`application/x-ndjson`), uma linha por profundidade, à medida que cada ponto é calculado.
+    Requer os mesmos dados do cálculo de tensões do endpoint /analisar/fluxo-hidraulico.
+    """
+    if (not dados_entrada.profundidades_tensao or
+        dados_entrada.profundidade_na_entrada is None or
+        dados_entrada.profundidade_na_saida is None or
+        not dados_entrada.direcao_fluxo_vertical):
+        raise HTTPException(status_code=400, detail="profundidades_tensao, profundidade_na_entrada, profundidade_na_saida e direcao_fluxo_vertical são necessários.")
+    if any(c.gamma_sat is None for c in dados_entrada.camadas):
+        raise HTTPException(status_code=400, detail="γ_sat deve ser definido para todas as camadas para cálculo de tensões com fluxo.")
+
+    try:
+        # A validação ocorre aqui, antes de a resposta começar a ser enviada
+        pontos = iter_tensoes_com_fluxo(
+            profundidades=dados_entrada.profundidades_tensao,
+            camadas=dados_entrada.camadas,
+            profundidade_na_entrada=dados_entrada.profundidade_na_entrada,
+            profundidade_na_saida=dados_entrada.profundidade_na_saida,
+            gamma_w=dados_entrada.peso_especifico_agua,
+            direcao_fluxo=dados_entrada.direcao_fluxo_vertical
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    # Gerador síncrono: o Starlette o consome no threadpool
+    linhas = (orjson.dumps(ponto) + b"\n" for ponto in pontos)  # orjson serializa dataclasses nativamente
+    return StreamingResponse(linhas, media_type="application/x-ndjson")
+
+# --- Lote ---
+
+@router.post("/fluxo-hidraulico/batch", response_model=FluxoHidraulicoBatchOutput, tags=["Lote"])
+async def post_analisar_fluxo_batch(dados_entrada: FluxoHidraulicoBatchInput):
+    return await calcular_lote(FluxoHidraulicoBatchOutput, FluxoHidraulicoInput, analisar_fluxo, dados_entrada.itens)
@@ -0,0 +1,33 @@
+# backend/app/routers/indices.py
+from fastapi import APIRouter
+
+from app.models import (
+    IndicesFisicosInput, IndicesFisicosOutput,
+    LimitesConsistenciaInput, LimitesConsistenciaOutput,
+    IndicesFisicosBatchInput, IndicesFisicosBatchOutput,
+    LimitesConsistenciaBatchInput, LimitesConsistenciaBatchOutput
+)
+from app.modules.indices_fisicos import calcular_indices_fisicos
+from app.modules.limites_consistencia import calcular_limites_consistencia
+from app.routers.comum import calcular_lote, responder
+
+router = APIRouter()
+
+
+@router.post("/indices-fisicos", response_model=IndicesFisicosOutput)
+async def post_calcular_indices(dados_entrada: IndicesFisicosInput):
+    return await responder(calcular_indices_fisicos, dados_entrada)
+
+@router.post("/limites-consistencia", response_model=LimitesConsistenciaOutput)
+async def post_calcular_limites(dados_entrada: LimitesConsistenciaInput):
+    return await responder(calcular_limites_consistencia, dados_entrada)
+
+# --- Lote ---
+
+@router.post("/indices-fisicos/batch", response_model=IndicesFisicosBatchOutput, tags=["Lote"])
+async def post_calcular_indices_batch(dados_entrada: IndicesFisicosBatchInput):
+    return await calcular_lote(IndicesFisicosBatchOutput, IndicesFisicosInput, calcular_indices_fisicos, dados_entrada.itens)
+
+@router.post("/limites-consistencia/batch", response_model=LimitesConsistenciaBatchOutput, tags=["Lote"])
+async def post_calcular_limites_batch(dados_entrada: LimitesConsistenciaBatchInput):
+    return await calcular_lote(LimitesConsistenciaBatchOutput, LimitesConsistenciaInput, calcular_limites_consistencia, dados_entrada.itens)
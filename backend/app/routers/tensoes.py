@@ -0,0 +1,35 @@
+# backend/app/routers/tensoes.py
+from fastapi import APIRouter
+
+from app.models import (
+    TensoesGeostaticasInput, TensoesGeostaticasOutput,
+    AcrescimoTensoesInput, AcrescimoTensoesOutput,
+    TensoesGeostaticasBatchInput, TensoesGeostaticasBatchOutput,
+    AcrescimoTensoesBatchInput, AcrescimoTensoesBatchOutput
+)
+from app.modules.tensoes_geostaticas import calcular_tensoes_geostaticas
+from app.modules.acrescimo_tensoes import calcular_acrescimo_tensoes
+from app.routers.comum import calcular_lote, responder
+
+router = APIRouter()
+
+
+@router.post("/tensoes-geostaticas", response_model=TensoesGeostaticasOutput)
+async def post_calcular_tensoes_geostaticas(dados_entrada: TensoesGeostaticasInput):
+    return await responder(calcular_tensoes_geostaticas, dados_entrada)
+
+@router.post("/acrescimo-tensoes", response_model=AcrescimoTensoesOutput)
+async def post_calcular_acrescimo_tensoes(dados_entrada: AcrescimoTensoesInput):
+    """ Calcula acréscimo de tensão para carga pontual, faixa ou circular. """
+    # A união discriminada de `carga` já garante exatamente um tipo de carga
+    return await responder(calcular_acrescimo_tensoes, dados_entrada)
+
+# --- Lote ---
+
+@router.post("/tensoes-geostaticas/batch", response_model=TensoesGeostaticasBatchOutput, tags=["Lote"])
+async def post_calcular_tensoes_geostaticas_batch(dados_entrada: TensoesGeostaticasBatchInput):
+    return await calcular_lote(TensoesGeostaticasBatchOutput, TensoesGeostaticasInput, calcular_tensoes_geostaticas, dados_entrada.itens)
+
+@router.post("/acrescimo-tensoes/batch", response_model=AcrescimoTensoesBatchOutput, tags=["Lote"])
+async def post_calcular_acrescimo_tensoes_batch(dados_entrada: AcrescimoTensoesBatchInput):
+    return await calcular_lote(AcrescimoTensoesBatchOutput, AcrescimoTensoesInput, calcular_acrescimo_tensoes, dados_entrada.itens)
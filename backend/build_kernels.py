@@ -0,0 +1,33 @@
+# backend/build_kernels.py
+"""
+Compila antecipadamente (AOT, com numba.pycc) os núcleos escalares de acréscimo de tensões
+e o perfil de tensões geostáticas no módulo nativo `app/modules/acrescimo_kernels.*.so`.
+
+Uso (no build/deploy, com Numba instalado):
+    python build_kernels.py
+
+`app.modules._kernels` importa o módulo gerado quando ele existe e, caso contrário,
+usa as versões JIT/Python. O binário depende da plataforma e não é versionado.
+"""
+import os
+
+from numba.pycc import CC
+
+from app.modules import _kernels
+
+DIRETORIO_MODULOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "modules")
+
+cc = CC("acrescimo_kernels")
+cc.output_dir = DIRETORIO_MODULOS
+
+# Mesmas assinaturas dos núcleos JIT; compila o código Python original de cada um
+cc.export("boussinesq_pontual", "f8(f8,f8,f8,f8,f8,f8)")(_kernels._boussinesq_pontual.py_func)
+cc.export("carothers_faixa", "f8(f8,f8,f8,f8)")(_kernels._carothers_faixa.py_func)
+cc.export("love_circular_centro", "f8(f8,f8,f8)")(_kernels._love_circular_centro.py_func)
+# Perfil geostático: arrays 1D de layout qualquer (as colunas do array estruturado das camadas
+# são vistas com passo), escrevendo nas linhas do array de saída
+cc.export("tensoes_geostaticas_perfil", "void(f8[:],f8[:],f8[:],f8[:],f8[:],f8,f8,f8,f8[:],f8[:],f8[:],f8[:])")(
+    _kernels._tensoes_geostaticas_perfil.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models import AcrescimoTensoesInput, CargaCircular, CargaFaixa, CargaPontual, PontoInteresse  # noqa: E402
+from app.modules.acrescimo_tensoes import calcular_acrescimo_tensoes  # noqa: E402
+
+PONTOS = [PontoInteresse(x=x, y=0.5, z=z) for x in (-2.0, 0.0, 1.5) for z in (0.5, 2.0, 6.0)]
+
+
+def _calcular_um_a_um(**carga):
+    return [
+        calcular_acrescimo_tensoes(AcrescimoTensoesInput(ponto_interesse=p, **carga)).model_dump()["delta_sigma_v"]
+        for p in PONTOS
+    ]
+
+
+def test_pontual_varios_pontos_igual_ao_calculo_ponto_a_ponto():
+    carga = dict(tipo_carga="pontual", carga=CargaPontual(x=0.2, y=-0.3, P=150.0))
+
+    resultado = calcular_acrescimo_tensoes(AcrescimoTensoesInput(pontos_interesse=PONTOS, **carga))
+
+    assert resultado.erro is None
+    assert resultado.delta_sigma_v is None
+    assert resultado.model_dump()["delta_sigma_v_pontos"] == _calcular_um_a_um(**carga)
+
+
+def test_faixa_varios_pontos_igual_ao_calculo_ponto_a_ponto():
+    carga = dict(tipo_carga="faixa", carga=CargaFaixa(largura=2.0, intensidade=100.0))
+
+    resultado = calcular_acrescimo_tensoes(AcrescimoTensoesInput(pontos_interesse=PONTOS, **carga))
+
+    assert resultado.erro is None
+    assert resultado.model_dump()["delta_sigma_v_pontos"] == _calcular_um_a_um(**carga)
+
+
+def test_circular_varios_pontos_igual_ao_calculo_ponto_a_ponto():
+    carga = dict(tipo_carga="circular", carga=CargaCircular(raio=1.5, intensidade=80.0))
+
+    resultado = calcular_acrescimo_tensoes(AcrescimoTensoesInput(pontos_interesse=PONTOS, **carga))
+
+    assert resultado.erro is None
+    assert resultado.model_dump()["delta_sigma_v_pontos"] == _calcular_um_a_um(**carga)
+
+
+def test_sem_ponto_de_interesse_retorna_erro():
+    resultado = calcular_acrescimo_tensoes(
+        AcrescimoTensoesInput(tipo_carga="pontual", carga=CargaPontual(P=100.0))
+    )
+
+    assert resultado.erro is not None
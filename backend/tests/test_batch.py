@@ -0,0 +1,79 @@
+import asyncio
+import os
+import sys
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.routers.adensamento import post_calcular_recalque_batch  # noqa: E402
+from app.routers.classificacao import post_classificar_uscs_batch  # noqa: E402
+from app.routers.comum import iniciar_pool_processos, parar_pool_processos  # noqa: E402
+from app.routers.tensoes import post_calcular_acrescimo_tensoes_batch  # noqa: E402
+from app.models import (  # noqa: E402
+    AcrescimoTensoesBatchInput, AcrescimoTensoesBatchOutput,
+    ClassificacaoUSCSBatchInput, ClassificacaoUSCSBatchOutput,
+    RecalqueAdensamentoBatchInput, RecalqueAdensamentoBatchOutput,
+)
+
+
+def _recalque(acrescimo, espessura_camada=5.0):
+    # Itens do lote chegam crus (como no corpo JSON) e são validados um a um
+    return dict(
+        espessura_camada=espessura_camada, indice_vazios_inicial=1.2, Cc=0.5, Cr=0.05,
+        tensao_efetiva_inicial=100.0, tensao_pre_adensamento=100.0, acrescimo_tensao=acrescimo,
+    )
+
+
+def test_recalque_batch_mantem_ordem_e_resultado_individual():
+    itens = [_recalque(acrescimo) for acrescimo in (50.0, 100.0, 200.0)]
+
+    resposta = asyncio.run(post_calcular_recalque_batch(RecalqueAdensamentoBatchInput(itens=itens)))
+    resultado = RecalqueAdensamentoBatchOutput.model_validate_json(resposta.body)
+
+    assert len(resultado.resultados) == 3
+    recalques = [r.recalque_total_primario for r in resultado.resultados]
+    assert recalques == sorted(recalques)
+    assert all(r.erro is None for r in resultado.resultados)
+
+
+def test_acrescimo_batch_reporta_erro_por_item():
+    carga = {"tipo": "pontual", "P": 100.0}
+    itens = [
+        {"tipo_carga": "pontual", "ponto_interesse": {"x": 0.0, "y": 0.0, "z": 2.0}, "carga": carga},
+        {"tipo_carga": "pontual", "carga": carga},
+    ]
+
+    resposta = asyncio.run(post_calcular_acrescimo_tensoes_batch(AcrescimoTensoesBatchInput(itens=itens)))
+    resultado = AcrescimoTensoesBatchOutput.model_validate_json(resposta.body)
+
+    assert resultado.resultados[0].erro is None
+    assert resultado.resultados[0].delta_sigma_v is not None
+    assert resultado.resultados[1].erro is not None
+
+
+def test_item_invalido_na_validacao_vira_erro_so_desse_item():
+    resposta = asyncio.run(post_calcular_recalque_batch(RecalqueAdensamentoBatchInput(itens=[_recalque(50.0), _recalque(50.0, espessura_camada=-1)])))
+    resultado = RecalqueAdensamentoBatchOutput.model_validate_json(resposta.body)
+
+    assert resultado.resultados[0].erro is None
+    assert resultado.resultados[1].erro.startswith("Entrada inválida: espessura_camada")
+
+    uscs = {"pass_peneira_200": 3.0, "pass_peneira_4": 80.0, "Cu": 7.0, "Cc": 2.0}
+    resposta = asyncio.run(post_classificar_uscs_batch(ClassificacaoUSCSBatchInput(itens=[uscs, {**uscs, "pass_peneira_200": 90.0}])))
+    resultado = ClassificacaoUSCSBatchOutput.model_validate_json(resposta.body)
+
+    assert resultado.resultados[0].classificacao is not None
+    assert "#200 não pode ser maior que a #4" in resultado.resultados[1].erro
+
+
+def test_recalque_batch_no_pool_de_processos():
+    itens = [_recalque(75.0)]
+    esperado = asyncio.run(post_calcular_recalque_batch(RecalqueAdensamentoBatchInput(itens=itens))).body
+
+    iniciar_pool_processos(1)
+    try:
+        resultado = asyncio.run(post_calcular_recalque_batch(RecalqueAdensamentoBatchInput(itens=itens))).body
+    finally:
+        parar_pool_processos()
+
+    assert resultado == esperado
@@ -0,0 +1,35 @@
+import os
+import sys
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.cache import CacheLRU, chave_cache  # noqa: E402
+from app.models import RecalqueAdensamentoInput  # noqa: E402
+from app.modules.recalque_adensamento import calcular_recalque_adensamento  # noqa: E402
+
+
+def test_cache_lru_descarta_item_menos_recente():
+    cache = CacheLRU(tamanho_maximo=2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obter("a") == 1  # "a" passa a ser o mais recente
+    cache.guardar("c", 3)
+
+    assert cache.obter("b") is None
+    assert cache.obter("a") == 1
+    assert cache.obter("c") == 3
+    assert len(cache) == 2
+
+
+def test_chave_cache_igual_para_entradas_iguais():
+    campos = dict(
+        espessura_camada=5.0, indice_vazios_inicial=1.2, Cc=0.5, Cr=0.05,
+        tensao_efetiva_inicial=100.0, tensao_pre_adensamento=150.0, acrescimo_tensao=80.0,
+    )
+    chave_1 = chave_cache(calcular_recalque_adensamento, RecalqueAdensamentoInput(**campos))
+    chave_2 = chave_cache(calcular_recalque_adensamento, RecalqueAdensamentoInput(**campos))
+    chave_3 = chave_cache(calcular_recalque_adensamento, RecalqueAdensamentoInput(**{**campos, "Cc": 0.6}))
+
+    assert chave_1 == chave_2
+    assert chave_1 != chave_3
@@ -0,0 +1,34 @@
+import os
+import sys
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models import CompactacaoInput, PontoEnsaioCompactacao  # noqa: E402
+from app.modules.compactacao import calcular_compactacao  # noqa: E402
+
+
+def _ponto(massa_umida_total=5800.0, massa_seca_recipiente_w=74.0):
+    return PontoEnsaioCompactacao(
+        massa_umida_total=massa_umida_total, massa_molde=4000.0, volume_molde=1000.0,
+        massa_umida_recipiente_w=80.0, massa_seca_recipiente_w=massa_seca_recipiente_w, massa_recipiente_w=20.0,
+    )
+
+
+def test_validacao_reporta_o_primeiro_ponto_invalido():
+    # Ponto 2: massa seca zero na umidade; ponto 4: massa úmida menor que o molde
+    pontos = [_ponto(), _ponto(massa_seca_recipiente_w=20.0), _ponto(), _ponto(massa_umida_total=3900.0)]
+
+    resultado = calcular_compactacao(CompactacaoInput(pontos_ensaio=pontos))
+
+    assert resultado.erro == "Massa seca inválida (0.0) no cálculo de umidade do ponto 2."
+    assert resultado.umidade_otima is None
+
+
+def test_entradas_iguais_comparam_como_iguais():
+    # A entrada congelada é comparada por valor (ex.: chave do cache), sem arrays guardados no modelo
+    a = CompactacaoInput(pontos_ensaio=[_ponto(), _ponto(5900.0), _ponto(6000.0)])
+    b = CompactacaoInput(pontos_ensaio=[_ponto(), _ponto(5900.0), _ponto(6000.0)])
+
+    assert a == b
+    assert a.model_copy(update={"pontos_ensaio": [_ponto(), _ponto(), _ponto()]}) != a
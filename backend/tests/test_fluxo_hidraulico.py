@@ -1,12 +1,17 @@
+import asyncio
 import math
 import os
 import sys
 
+import numpy as np
+
 # Ajusta o caminho para permitir importações do pacote 'app'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from app.main import post_analisar_fluxo  # noqa: E402
-from app.models import CamadaFluxo, FluxoHidraulicoInput  # noqa: E402
+from app.routers.fluxo import post_analisar_fluxo  # noqa: E402
+from app.models import CamadaFluxo, FluxoHidraulicoInput, FluxoHidraulicoOutput  # noqa: E402
+from app.modules._arredondamento import arredondar_casas  # noqa: E402
+from app.modules.fluxo_hidraulico import calcular_fs_liquefacao_batch, calcular_gradiente_critico_batch  # noqa: E402
 
 
 def test_fluxo_hidraulico_fs_liquefacao_finito_sem_erros():
@@ -24,8 +29,46 @@ def test_fluxo_hidraulico_fs_liquefacao_finito_sem_erros():
         peso_especifico_agua=10.0,
     )
 
-    resultado = post_analisar_fluxo(dados_entrada)
+    resposta = asyncio.run(post_analisar_fluxo(dados_entrada))
+    resultado = FluxoHidraulicoOutput.model_validate_json(resposta.body)
 
     assert resultado.fs_liquefacao is not None
     assert math.isfinite(resultado.fs_liquefacao)
     assert resultado.erro in (None, "")
+
+
+def test_erro_de_gamma_sat_mantem_k_eq_e_velocidades_ja_calculados():
+    dados_entrada = FluxoHidraulicoInput(
+        camadas=[CamadaFluxo(espessura=2.0, k=1e-5, n=0.35), CamadaFluxo(espessura=3.0, k=5e-6, n=0.38)],
+        direcao_permeabilidade_equivalente="horizontal",
+        gradiente_hidraulico_aplicado=0.8,
+        direcao_fluxo_vertical="ascendente",
+    )
+
+    resposta = asyncio.run(post_analisar_fluxo(dados_entrada))
+    resultado = FluxoHidraulicoOutput.model_validate_json(resposta.body)
+
+    assert resultado.erro == "γ_sat da última camada necessário para calcular icrit."
+    assert resultado.permeabilidade_equivalente is not None
+    assert resultado.velocidade_descarga is not None
+    assert resultado.gradiente_critico is None
+
+
+def test_gradiente_critico_e_fs_vetorizados_ao_longo_do_perfil():
+    # γsat por camada: a terceira (γsat < γw) não tem icrit definido
+    icrit = calcular_gradiente_critico_batch([18.5, 20.0, 9.0, 10.0], 10.0)
+    fs = calcular_fs_liquefacao_batch(icrit, [0.5, 0.0, 1.2, 0.8])
+
+    np.testing.assert_allclose(icrit, [0.85, 1.0, np.nan, 0.0])
+    np.testing.assert_allclose(fs, [1.7, np.inf, np.nan, 0.0])
+
+
+def test_arredondamento_vetorizado_igual_ao_round_do_python():
+    # np.round(64.2555, 3) dá 64.256; round() dá 64.255 (o float está abaixo do meio)
+    valores = [64.2555, 0.00035, -1.0005, 12.3456789]
+    resultados = np.array([valores])
+
+    arredondar_casas(resultados, 3)
+
+    assert resultados[0].tolist() == [round(v, 3) for v in valores]
+
@@ -0,0 +1,30 @@
+import math
+import os
+import sys
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models import LimitesConsistenciaInput, PontoCurva, PontoEnsaioLL  # noqa: E402
+from app.modules.limites_consistencia import calcular_limites_consistencia  # noqa: E402
+
+
+def _ponto_ll(num_golpes, massa_seca_recipiente):
+    return PontoEnsaioLL(
+        num_golpes=num_golpes, massa_umida_recipiente=60.0,
+        massa_seca_recipiente=massa_seca_recipiente, massa_recipiente=20.0,
+    )
+
+
+def test_pontos_grafico_ll_sao_floats_python_em_log10_dos_golpes():
+    dados = LimitesConsistenciaInput(
+        pontos_ll=[_ponto_ll(15, 48.0), _ponto_ll(25, 49.0), _ponto_ll(35, 50.0)],
+        massa_umida_recipiente_lp=30.0, massa_seca_recipiente_lp=28.0, massa_recipiente_lp=20.0,
+    )
+
+    resultado = calcular_limites_consistencia(dados)
+
+    assert resultado.erro is None
+    pontos = resultado.pontos_grafico_ll
+    assert all(type(p) is PontoCurva and type(p.x) is float and type(p.y) is float for p in pontos)
+    assert [p.x for p in pontos] == [math.log10(15), math.log10(25), math.log10(35)]
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import numpy as np
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.modules.tempo_adensamento import calcular_Uz_de_Tv, calcular_Uz_de_Tv_batch  # noqa: E402
+
+
+def test_Uz_de_Tv_batch_concorda_com_a_versao_escalar():
+    # Dois ramos (Tv <= 0.283 e acima), Tv = 0, Tv enorme e Tv negativo (None -> NaN)
+    tvs = [0.0, 0.05, 0.283, 0.2831, 0.848, 2.0, 1e308, -0.1]
+
+    uz = calcular_Uz_de_Tv_batch(tvs)
+
+    esperado = [np.nan if v is None else v for v in map(calcular_Uz_de_Tv, tvs)]
+    np.testing.assert_allclose(uz, esperado, rtol=1e-14)
+    assert uz[-2] == 100.0
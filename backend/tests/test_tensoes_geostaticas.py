@@ -0,0 +1,68 @@
+import os
+import sys
+from dataclasses import astuple
+
+# Ajusta o caminho para permitir importações do pacote 'app'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models import CamadaSolo, TensaoPonto, TensoesGeostaticasInput  # noqa: E402
+from app.modules.tensoes_geostaticas import calcular_tensoes_geostaticas  # noqa: E402
+
+
+def test_perfil_com_na_atravessando_camada():
+    dados = TensoesGeostaticasInput(
+        camadas=[
+            CamadaSolo(espessura=2.0, gama_nat=17.0, gama_sat=19.0, Ko=0.5),
+            CamadaSolo(espessura=3.0, gama_sat=20.0, Ko=0.5),
+        ],
+        profundidade_na=1.0,
+    )
+
+    resultado = calcular_tensoes_geostaticas(dados)
+
+    assert resultado.erro is None
+    # (z, σv, u, σ'v, σ'h): superfície, NA, base da camada 1, base da camada 2
+    assert [
+        (p.profundidade, p.tensao_total_vertical, p.pressao_neutra, p.tensao_efetiva_vertical, p.tensao_efetiva_horizontal)
+        for p in resultado.pontos_calculo
+    ] == [
+        (0.0, 0.0, 0.0, 0.0, 0.0),
+        (1.0, 17.0, 0.0, 17.0, 8.5),
+        (2.0, 36.0, 10.0, 26.0, 13.0),
+        (5.0, 96.0, 40.0, 56.0, 28.0),
+    ]
+
+
+def test_camada_sem_gama_nat_acima_do_na_retorna_erro():
+    dados = TensoesGeostaticasInput(
+        camadas=[CamadaSolo(espessura=2.0, gama_sat=19.0), CamadaSolo(espessura=3.0, gama_sat=20.0)],
+        profundidade_na=4.0,
+    )
+
+    resultado = calcular_tensoes_geostaticas(dados)
+
+    assert resultado.pontos_calculo == []
+    assert "camada 1" in resultado.erro
+
+
+def test_pontos_sao_dataclasses_com_floats_python():
+    dados = TensoesGeostaticasInput(camadas=[CamadaSolo(espessura=2.0, gama_nat=17.0, gama_sat=19.0)], profundidade_na=1.0)
+
+    resultado = calcular_tensoes_geostaticas(dados)
+
+    # Floats Python vindos do array de colunas (via .tolist()), não escalares NumPy
+    assert all(type(p) is TensaoPonto for p in resultado.pontos_calculo)
+    assert all(type(v) is float for p in resultado.pontos_calculo for v in astuple(p))
+
+
+def test_profundidades_arredondadas_como_o_round_do_python():
+    # Com np.round a camada de 5e-05 m sumiria (0.0) e 0.00035 viraria 0.0004
+    for espessura, esperada in ((5e-05, 0.0001), (0.00035, 0.0003)):
+        dados = TensoesGeostaticasInput(
+            camadas=[CamadaSolo(espessura=espessura, gama_nat=18.0), CamadaSolo(espessura=2.0, gama_nat=18.0)],
+            profundidade_na=10.0,
+        )
+
+        resultado = calcular_tensoes_geostaticas(dados)
+
+        assert [p.profundidade for p in resultado.pontos_calculo] == [0.0, esperada, round(espessura + 2.0, 4)]